@@ -0,0 +1,203 @@
+import asyncio
+
+from task_manager import TaskManager, TaskFileManager
+
+
+class AsyncTaskManager:
+    """
+    An asyncio front-end for a TaskManager and its TaskFileManager. Changes are applied in
+    memory right away and saved behind the caller's back: the first change starts a timer,
+    every change made before it fires is folded into the same save, and the file is written
+    in an executor so the event loop is never blocked by disk I/O.
+    Changes made directly on the wrapped manager, for example by a TaskScheduler, are saved too.
+    The manager is not thread-safe, so it should only be used from the event loop's thread.
+    Writes never overlap. If a background save fails, the changes stay unsaved and are written
+    by the next save, and save() and close() raise the error if writing fails again.
+    Attributes:
+        manager (TaskManager): the wrapped task manager, its read methods can be called directly.
+        file_manager (TaskFileManager): the file the tasks are saved to and loaded from.
+        save_delay (float): seconds between the first unsaved change and the save covering it.
+        executor (concurrent.futures.Executor): where files are read and written, None for the loop's default.
+    """
+
+    def __init__(self, manager=None, file_manager=None, save_delay=0.5, executor=None):
+        self.manager = manager if manager is not None else TaskManager()
+        self.file_manager = file_manager if file_manager is not None else TaskFileManager()
+        self.save_delay = save_delay
+        self.executor = executor
+        self.__dirty = False
+        self.__loading = False
+        self.__saver = None
+        self.__save_now = None
+        self.__write_lock = asyncio.Lock()
+        self.manager.add_listener(self.__on_change)
+
+    def __on_change(self, action, task):
+        if self.__loading:
+            return
+        self.__dirty = True
+        if self.__saver is None or self.__saver.done():
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                # changed outside the loop, the change is written by the next save
+                return
+            self.__save_now = asyncio.Event()
+            self.__saver = loop.create_task(self.__save_behind())
+
+    async def __save_behind(self):
+        while self.__dirty:
+            try:
+                await asyncio.wait_for(self.__save_now.wait(), self.save_delay)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.__write()
+            except Exception:
+                # the changes stay unsaved; save() or the saver started by the next change writes them
+                return
+
+    async def __write(self):
+        # the lock keeps writes from overlapping, so saves reach the file in order
+        async with self.__write_lock:
+            if not self.__dirty:
+                return
+            self.__dirty = False
+            # rows are copied on the loop's thread, so the executor never sees a change half done
+            rows = [list(task) for task in self.manager.tasks]
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(self.executor, self.file_manager.save_tasks_to_file, rows)
+            except BaseException:
+                self.__dirty = True
+                raise
+
+    async def load(self):
+        """
+        Reads the tasks from the file in the executor and adds them to the manager.
+        Loaded tasks are not saved back.
+        Returns:
+            list of tuple: (row index, error message) for every loaded task the manager rejected.
+        """
+        loop = asyncio.get_running_loop()
+        rows = await loop.run_in_executor(self.executor, self.file_manager.load_tasks_from_file)
+        self.__loading = True
+        try:
+            return self.manager.add_tasks(rows)
+        finally:
+            self.__loading = False
+
+    async def save(self):
+        """
+        Saves the tasks now and waits until they are written, instead of waiting for save_delay.
+        Changes a failed background save left unsaved are written again.
+        Raises:
+            Exception: Whatever the file manager raised if the tasks could not be written.
+        """
+        if self.__saver is not None and not self.__saver.done():
+            self.__save_now.set()
+            await self.__saver
+        await self.__write()
+
+    async def close(self):
+        """
+        Saves the pending changes and stops following the manager's changes.
+        """
+        await self.save()
+        self.manager.remove_listener(self.__on_change)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def add_task(self, task_id, description, priority, deadline_str, completed=False):
+        """
+        Adds a new task. See TaskManager.add_task.
+        Raises:
+            ValueError: If the priority is invalid, the date format is incorrect or task ID already exists.
+        """
+        return self.manager.add_task(task_id, description, priority, deadline_str, completed)
+
+    async def remove_task(self, task_id):
+        """
+        Removes a task. See TaskManager.remove_task.
+        Returns:
+            str: A message if the task was not found.
+        """
+        return self.manager.remove_task(task_id)
+
+    async def update_task(self, task_id, updated_task):
+        """
+        Updates a task. See TaskManager.update_task.
+        Raises:
+            ValueError: If any of the keys are invalid or the date format is incorrect.
+        Returns:
+            str: A message if the task was not found.
+        """
+        return self.manager.update_task(task_id, updated_task)
+
+    async def add_tasks(self, tasks):
+        """
+        Adds many tasks at once. See TaskManager.add_tasks.
+        Returns:
+            list of tuple: (row index, error message) for every row that was not added.
+        """
+        return self.manager.add_tasks(tasks)
+
+    async def remove_tasks(self, task_ids):
+        """
+        Removes many tasks at once. See TaskManager.remove_tasks.
+        Returns:
+            list of tuple: (row index, error message) for every ID that was not found.
+        """
+        return self.manager.remove_tasks(task_ids)
+
+    async def update_tasks(self, updates):
+        """
+        Updates many tasks at once. See TaskManager.update_tasks.
+        Returns:
+            list of tuple: (row index, error message) for every update that was not applied.
+        """
+        return self.manager.update_tasks(updates)
+
+    @staticmethod
+    async def __stream(page, page_size):
+        cursor = None
+        while True:
+            tasks, cursor = page(limit=page_size, cursor=cursor)
+            for task in tasks:
+                yield task
+            if cursor is None:
+                return
+            # let other coroutines run between pages, the cursor keeps the order stable meanwhile
+            await asyncio.sleep(0)
+
+    def iter_tasks_by_deadline(self, ascending=True, page_size=500):
+        """
+        Streams the tasks with a deadline in deadline order, one page at a time. Tasks may be
+        changed between pages; every task left unchanged is yielded exactly once.
+        Args:
+            ascending (bool, optional): earliest deadline first if True, else latest first.
+            page_size (int, optional): number of tasks read before the loop gets control back.
+        Returns:
+            async iterator: The tasks.
+        """
+        def page(limit, cursor):
+            return self.manager.page_tasks_by_deadline(limit, cursor, ascending)
+        return self.__stream(page, page_size)
+
+    def iter_tasks_by_priority(self, ascending=True, page_size=500):
+        """
+        Streams the tasks in priority order, one page at a time. Tasks may be changed
+        between pages; every task left unchanged is yielded exactly once.
+        Args:
+            ascending (bool, optional): lowest priority first if True, else highest first.
+            page_size (int, optional): number of tasks read before the loop gets control back.
+        Returns:
+            async iterator: The tasks.
+        """
+        def page(limit, cursor):
+            return self.manager.page_tasks_by_priority(limit, cursor, ascending)
+        return self.__stream(page, page_size)
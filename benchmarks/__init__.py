@@ -0,0 +1,4 @@
+"""
+Benchmarks for the task manager. Run them from the repository root, for example:
+    python -m benchmarks.bench_bulk
+"""
@@ -0,0 +1,48 @@
+"""
+Compares loading tasks one by one through TaskManager.add_task with the batch
+TaskManager.add_tasks path.
+
+    python -m benchmarks.bench_bulk --sizes 10000 100000 1000000
+"""
+import argparse
+
+from benchmarks.common import generate_tasks, timed
+from task_manager import TaskManager
+
+
+def add_one_by_one(rows):
+    manager = TaskManager()
+    for row in rows:
+        manager.add_task(*row)
+    return manager
+
+
+def add_in_batch(rows):
+    manager = TaskManager()
+    errors = manager.add_tasks(rows)
+    assert not errors, errors[:5]
+    return manager
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--max-single", type=int, default=100_000,
+                        help="skip the one-by-one path above this many tasks")
+    args = parser.parse_args()
+
+    print(f"{'tasks':>10} {'add_task/s':>14} {'add_tasks/s':>14} {'speedup':>8}")
+    for size in args.sizes:
+        rows = generate_tasks(size)
+        batch_seconds, _ = timed(add_in_batch, rows)
+        batch_rate = size / batch_seconds
+        if size <= args.max_single:
+            single_seconds, _ = timed(add_one_by_one, rows)
+            single_rate = size / single_seconds
+            print(f"{size:>10} {single_rate:>14,.0f} {batch_rate:>14,.0f} {batch_rate / single_rate:>7.1f}x")
+        else:
+            print(f"{size:>10} {'skipped':>14} {batch_rate:>14,.0f} {'-':>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Stress test and read throughput benchmark for ConcurrentTaskManager. Writer
+threads add, update and remove tasks while reader threads query the manager
+and check that every read sees a consistent state.
+
+    python -m benchmarks.bench_concurrency --tasks 20000 --seconds 3
+"""
+import argparse
+import random
+import threading
+import time
+
+from benchmarks.common import generate_tasks
+from concurrent_task_manager import ConcurrentTaskManager
+
+
+def check_consistent(manager):
+    with manager.lock.read():
+        tasks = manager.tasks
+        assert len(tasks) == len(manager.tasks_by_deadline) == len(manager.tasks_by_priority)
+        assert manager.statistics.total == len(tasks)
+        deadline_keys = [manager.tasks_by_deadline.key(task) for task in manager.tasks_by_deadline]
+        assert deadline_keys == sorted(deadline_keys)
+
+
+def writer(manager, first_id, stop, counts, slot, errors, finished):
+    rng = random.Random(first_id)
+    rows = generate_tasks(10_000, seed=first_id)
+    next_id = first_id
+    while not stop.is_set():
+        task_id, description, priority, deadline_str, completed = rows[next_id % len(rows)]
+        try:
+            manager.add_task(next_id, description, priority, deadline_str, completed)
+            manager.update_task(next_id, {"priority": rng.choice(manager.PRIORITIES)})
+            if rng.random() < 0.5:
+                manager.remove_task(next_id)
+        except Exception as e:
+            errors.append(e)
+        next_id += 1
+        counts[slot] += 3
+    finished.append(slot)
+
+
+def reader(manager, stop, counts, slot, errors, finished):
+    rng = random.Random()
+    while not stop.is_set():
+        # a torn read shows up as any error, not only as a failed assertion
+        try:
+            day = f"{rng.randint(1, 28):02d}-{rng.randint(1, 12):02d}-2024"
+            tasks = manager.tasks_before(day)
+            assert all(task[3] is not None for task in tasks)
+            manager.query().priority("high").completed(False).order_by("deadline").limit(20).all()
+            if counts[slot] % 200 == 0:
+                check_consistent(manager)
+        except Exception as e:
+            errors.append(e)
+        counts[slot] += 1
+    finished.append(slot)
+
+
+def run(tasks, readers, writers, seconds):
+    manager = ConcurrentTaskManager()
+    manager.add_tasks(generate_tasks(tasks))
+    stop = threading.Event()
+    # every thread counts in its own slot, so the counts need no lock
+    reads, writes, errors, finished = [0] * readers, [0] * writers, [], []
+    threads = [threading.Thread(target=writer, args=(manager, tasks + i * 10 ** 9, stop, writes, i, errors, finished))
+               for i in range(writers)]
+    threads += [threading.Thread(target=reader, args=(manager, stop, reads, i, errors, finished))
+                for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    if len(finished) != len(threads):
+        errors.append(RuntimeError(f"{len(threads) - len(finished)} threads died before the end of the run."))
+    check_consistent(manager)
+    return sum(reads) / seconds, sum(writes) / seconds, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=20_000)
+    parser.add_argument("--seconds", type=float, default=3)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--readers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    print(f"{'readers':>8} {'reads/s':>10} {'writes/s':>10} {'errors':>7}")
+    for readers in args.readers:
+        reads, writes, errors = run(args.tasks, readers, args.writers, args.seconds)
+        print(f"{readers:>8} {reads:>10,.0f} {writes:>10,.0f} {len(errors):>7}")
+        if errors:
+            raise errors[0]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Compares TaskFileManager.load_tasks_from_file with the previous loader, which
+called datetime.strptime on every line, and measures how soon the streaming
+loader yields its first task.
+
+    python -m benchmarks.bench_loader --size 1000000
+"""
+import argparse
+import os
+import tempfile
+from datetime import datetime
+
+from benchmarks.common import generate_tasks, timed
+from task_manager import TaskFileManager, TaskManager
+
+
+def load_with_strptime(filename):
+    tasks = []
+    with open(filename, "r") as f:
+        for line in f:
+            task_data = line.strip().split(',')
+            deadline = datetime.strptime(task_data[3], "%d-%m-%Y") if task_data[3] != 'None' else None
+            priority = task_data[2] if task_data[2] else None
+            tasks.append([int(task_data[0]), task_data[1], priority, deadline, task_data[4] == 'True'])
+    return tasks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    manager = TaskManager()
+    manager.add_tasks(generate_tasks(args.size))
+    with tempfile.TemporaryDirectory() as directory:
+        file_manager = TaskFileManager(os.path.join(directory, "tasks.txt"))
+        file_manager.save_tasks_to_file(manager.tasks)
+
+        baseline_seconds, baseline_tasks = timed(load_with_strptime, file_manager.filename)
+        streaming_seconds, streaming_tasks = timed(file_manager.load_tasks_from_file)
+        assert baseline_tasks == streaming_tasks
+        first_task_seconds, _ = timed(next, file_manager.iter_tasks_from_file())
+
+    print(f"{'loader':>12} {'seconds':>9} {'tasks/s':>12}")
+    print(f"{'strptime':>12} {baseline_seconds:>9.2f} {args.size / baseline_seconds:>12,.0f}")
+    print(f"{'streaming':>12} {streaming_seconds:>9.2f} {args.size / streaming_seconds:>12,.0f}")
+    print(f"speedup {baseline_seconds / streaming_seconds:.1f}x, first task after {first_task_seconds * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Measures the memory used per task by TaskManager, including its indexes, with
+list-based tasks and with compact CompactTask records.
+
+    python -m benchmarks.bench_memory --size 200000
+"""
+import argparse
+import gc
+import tracemalloc
+
+from benchmarks.common import generate_tasks
+from task_manager import TaskManager
+
+
+def bytes_per_task(rows, compact):
+    gc.collect()
+    tracemalloc.start()
+    manager = TaskManager(compact=compact)
+    errors = manager.add_tasks(rows)
+    assert not errors, errors[:5]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rows = generate_tasks(args.size)
+    list_bytes = bytes_per_task(rows, compact=False)
+    compact_bytes = bytes_per_task(rows, compact=True)
+    print(f"{'storage':>10} {'bytes/task':>12}")
+    print(f"{'list':>10} {list_bytes:>12,.0f}")
+    print(f"{'compact':>10} {compact_bytes:>12,.0f}")
+    print(f"saved {1 - compact_bytes / list_bytes:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Compares loading a tasks file serially, with load_tasks_from_file and
+add_tasks, with the parallel path, where worker processes parse and sort
+chunks of the file and add_task_runs merges the sorted runs.
+
+    python -m benchmarks.bench_parallel_load --tasks 1000000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import tempfile
+
+from benchmarks.common import generate_tasks, timed
+from task_manager import TaskFileManager, TaskManager
+
+
+def snapshot(manager):
+    return (manager.tasks, list(manager.tasks_by_deadline), list(manager.tasks_by_priority),
+            {priority: list(bucket) for priority, bucket in manager.priority_buckets.items()})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    source = TaskManager()
+    source.add_tasks(generate_tasks(args.tasks))
+    with tempfile.TemporaryDirectory() as directory:
+        file_manager = TaskFileManager(os.path.join(directory, "tasks.txt"))
+        file_manager.save_tasks_to_file(source.tasks)
+        del source
+
+        print(f"{'loader':>12} {'parse s':>8} {'index s':>8} {'total s':>8} {'speedup':>8}")
+        serial = TaskManager()
+        parse_seconds, rows = timed(file_manager.load_tasks_from_file)
+        index_seconds, errors = timed(serial.add_tasks, rows)
+        assert not errors, errors[:5]
+        serial_seconds = parse_seconds + index_seconds
+        print(f"{'serial':>12} {parse_seconds:>8.2f} {index_seconds:>8.2f} {serial_seconds:>8.2f} {1:>7.1f}x")
+        expected = snapshot(serial)
+        del serial, rows
+
+        for workers in args.workers:
+            manager = TaskManager()
+            parse_seconds, runs = timed(file_manager.load_task_runs, workers)
+            index_seconds, errors = timed(manager.add_task_runs, runs)
+            assert not errors, errors[:5]
+            assert snapshot(manager) == expected
+            total_seconds = parse_seconds + index_seconds
+            print(f"{f'{workers} workers':>12} {parse_seconds:>8.2f} {index_seconds:>8.2f} {total_seconds:>8.2f} "
+                  f"{serial_seconds / total_seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Compares one TaskManager with a ShardedTaskManager whose shards run in the
+current process or in worker processes: bulk loading, a fan-out range query
+and a top-k query merged across the shards.
+
+    python -m benchmarks.bench_sharded --tasks 200000 --shards 2 4 8
+"""
+import argparse
+
+from benchmarks.common import generate_tasks, timed
+from sharded_task_manager import ShardedTaskManager
+from task_manager import TaskManager
+
+
+def measure(manager, rows):
+    load_seconds, errors = timed(manager.add_tasks, rows)
+    assert not errors, errors[:5]
+    range_seconds, found = timed(manager.tasks_between, "01-03-2024", "01-09-2024")
+    top_seconds, _ = timed(lambda: list(manager.iter_tasks_by_priority(ascending=False, limit=100)))
+    return load_seconds, range_seconds, top_seconds, len(found)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=200_000)
+    parser.add_argument("--shards", type=int, nargs="+", default=[2, 4, 8])
+    args = parser.parse_args()
+    rows = generate_tasks(args.tasks)
+
+    print(f"{'manager':>22} {'load s':>8} {'range s':>8} {'top-100 ms':>11}")
+
+    def report(name, result):
+        load_seconds, range_seconds, top_seconds, _ = result
+        print(f"{name:>22} {load_seconds:>8.2f} {range_seconds:>8.3f} {top_seconds * 1000:>11.2f}")
+
+    expected = measure(TaskManager(), rows)
+    report("TaskManager", expected)
+    for shards in args.shards:
+        for processes in (False, True):
+            with ShardedTaskManager(shards=shards, processes=processes) as manager:
+                result = measure(manager, rows)
+            assert result[3] == expected[3]
+            report(f"{shards} shards{' (processes)' if processes else ''}", result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Compares the in-memory TaskManager with SQLiteTaskManager on a database file:
+loading, Python memory, and point, range, top-k and full-scan queries.
+
+    python -m benchmarks.bench_sqlite --size 1000000
+"""
+import argparse
+import gc
+import os
+import random
+import tempfile
+import tracemalloc
+
+from benchmarks.common import generate_tasks, timed
+from sqlite_task_manager import SQLiteTaskManager
+from task_manager import TaskManager
+
+
+def queries(manager, size, seed=7):
+    rng = random.Random(seed)
+    task_ids = [rng.randrange(size) for _ in range(1000)]
+    return [
+        ("get_task x1000", lambda: [manager.get_task(task_id) for task_id in task_ids]),
+        ("find_task_by_deadline", lambda: manager.find_task_by_deadline("15-06-2024")),
+        ("filter_tasks_by_deadline", lambda: manager.filter_tasks_by_deadline("10-01-2024")),
+        ("most_urgent_tasks k=10", lambda: manager.most_urgent_tasks("high", 10)),
+        # the cursors of the two engines differ, only the pages are compared
+        ("page_tasks_by_deadline", lambda: manager.page_tasks_by_deadline(50)[0]),
+        ("find_task_by_priority", lambda: manager.find_task_by_priority("high")),
+        ("sort_tasks_by_priority", lambda: manager.sort_tasks_by_priority()),
+    ]
+
+
+def load(factory, rows):
+    gc.collect()
+    tracemalloc.start()
+    seconds, manager = timed(lambda: factory())
+    load_seconds, errors = timed(manager.add_tasks, rows)
+    assert not errors, errors[:5]
+    python_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return manager, seconds + load_seconds, python_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rows = generate_tasks(args.size)
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, "tasks.db")
+        memory_manager, memory_load, memory_bytes = load(TaskManager, rows)
+        sqlite_manager, sqlite_load, sqlite_bytes = load(lambda: SQLiteTaskManager(database), rows)
+
+        print(f"{'':>26} {'TaskManager':>14} {'SQLite':>14}")
+        print(f"{'load (s)':>26} {memory_load:>14.2f} {sqlite_load:>14.2f}")
+        print(f"{'python heap (MiB)':>26} {memory_bytes / 2 ** 20:>14.1f} {sqlite_bytes / 2 ** 20:>14.1f}")
+        print(f"{'database file (MiB)':>26} {'-':>14} {os.path.getsize(database) / 2 ** 20:>14.1f}")
+        for (name, memory_query), (_, sqlite_query) in zip(queries(memory_manager, args.size),
+                                                           queries(sqlite_manager, args.size)):
+            memory_seconds, memory_result = timed(memory_query)
+            sqlite_seconds, sqlite_result = timed(sqlite_query)
+            assert memory_result == sqlite_result, name
+            print(f"{name + ' (ms)':>26} {memory_seconds * 1000:>14.2f} {sqlite_seconds * 1000:>14.2f}")
+        sqlite_manager.close()
+
+
+if __name__ == "__main__":
+    main()
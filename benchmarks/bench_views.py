@@ -0,0 +1,80 @@
+"""
+Compares keeping a standing view ("pending high-priority tasks by deadline")
+up to date with a TaskView against recomputing it with find_task_by_priority
+and sorting after every update. Both variants apply the same updates to fresh,
+identical managers, and the best of several repeats is reported.
+
+    python -m benchmarks.bench_views --tasks 200000 --updates 2000 --repeat 5
+"""
+import argparse
+import random
+from datetime import datetime
+
+from benchmarks.common import generate_tasks, timed
+from task_manager import TaskManager
+
+
+def is_pending_high(task):
+    return task[2] == "high" and not task[4]
+
+
+def deadline(task):
+    return task[3] or datetime.max
+
+
+def recompute(manager):
+    return sorted((task for task in manager.find_task_by_priority("high") if not task[4]),
+                  key=lambda task: (deadline(task), task[0]))
+
+
+def apply_updates(manager, updates):
+    for task_id, changes in updates:
+        manager.update_task(task_id, changes)
+
+
+def time_updates(rows, updates, with_view):
+    """
+    Applies the updates to a fresh manager, with or without the view.
+    Returns:
+        tuple: (seconds taken by the updates, the manager).
+    """
+    manager = TaskManager()
+    manager.add_tasks(rows)
+    if with_view:
+        manager.add_view("pending_high", is_pending_high, deadline)
+    seconds, _ = timed(apply_updates, manager, updates)
+    return seconds, manager
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=200_000)
+    parser.add_argument("--updates", type=int, default=2_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rows = generate_tasks(args.tasks, args.seed)
+    rng = random.Random(args.seed)
+    updates = [(rng.randrange(args.tasks),
+                {"priority": rng.choice(TaskManager.PRIORITIES), "completed": rng.random() < 0.3})
+               for _ in range(args.updates)]
+
+    plain_seconds = view_seconds = recompute_seconds = float("inf")
+    for _ in range(args.repeat):
+        seconds, _ = time_updates(rows, updates, with_view=False)
+        plain_seconds = min(plain_seconds, seconds)
+        seconds, manager = time_updates(rows, updates, with_view=True)
+        view_seconds = min(view_seconds, seconds)
+        seconds, expected = timed(recompute, manager)
+        recompute_seconds = min(recompute_seconds, seconds)
+        assert list(manager.views["pending_high"]) == expected
+
+    view_us = (view_seconds - plain_seconds) / args.updates * 1e6
+    print(f"{'update_task without views':>28} {plain_seconds / args.updates * 1e6:>12,.1f} us")
+    print(f"{'view upkeep per update':>28} {view_us:>12,.1f} us")
+    print(f"{'recompute per update':>28} {recompute_seconds * 1e6:>12,.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import random
+import time
+from datetime import datetime, timedelta
+
+from task_manager import TaskManager
+
+
+def generate_tasks(count, seed=42, priority_weights=None, deadline_days=730, skew=0.0, hot_dates=5, undated=0.0):
+    """
+    Generates synthetic task rows as accepted by TaskManager.add_task.
+    Args:
+        count (int): Number of tasks to generate.
+        seed (int, optional): Seed for the random generator, so runs are reproducible.
+        priority_weights (list of float, optional): relative weights of low, medium and high. Defaults to equal weights.
+        deadline_days (int, optional): deadlines are spread over this many days from 01-01-2024.
+        skew (float, optional): share of the tasks due on one of a few hot dates, to create many duplicate deadlines.
+        hot_dates (int, optional): number of hot dates used by skew.
+        undated (float, optional): share of the tasks without a deadline.
+    Returns:
+        list of tuple: Rows of (task_id, description, priority, deadline_str, completed).
+    """
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    hot_days = [rng.randrange(deadline_days) for _ in range(hot_dates)] if skew else []
+    rows = []
+    for task_id in range(count):
+        # the defaults draw from rng exactly as before, so existing benchmarks keep their data
+        if skew and rng.random() < skew:
+            day = rng.choice(hot_days)
+        else:
+            day = rng.randrange(deadline_days)
+        deadline_str = (start + timedelta(days=day)).strftime("%d-%m-%Y")
+        if undated and rng.random() < undated:
+            deadline_str = None
+        if priority_weights is None:
+            priority = rng.choice(TaskManager.PRIORITIES)
+        else:
+            priority = rng.choices(TaskManager.PRIORITIES, priority_weights)[0]
+        rows.append((
+            task_id,
+            f"Task number {task_id}",
+            priority,
+            deadline_str,
+            rng.random() < 0.3,
+        ))
+    rng.shuffle(rows)
+    return rows
+
+
+def timed(function, *args, **kwargs):
+    """
+    Runs a function once and measures it.
+    Returns:
+        tuple: (seconds taken, return value of the function).
+    """
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return time.perf_counter() - start, result
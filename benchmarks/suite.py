@@ -0,0 +1,267 @@
+"""
+Benchmark suite for the TaskManager and TaskFileManager hot paths. Every case is
+run against a manager holding each of the given numbers of tasks and reports
+operations per second, latency percentiles and the peak memory allocated while
+the case runs. Results can be saved as JSON and compared with an earlier run.
+
+    python -m benchmarks.suite --sizes 1000 10000 100000 1000000 --json run.json
+    python -m benchmarks.suite --sizes 1000 10000 --compare run.json
+    python -m benchmarks.suite --skew 0.5 --undated 0.1 --priority-weights 6 3 1 --cases find_task_by_deadline
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from benchmarks.common import generate_tasks
+from task_manager import BinaryTaskFileManager, TaskFileManager, TaskManager, TaskStatistics
+
+
+class Case:
+    """
+    One benchmarked operation.
+    Attributes:
+        name (str): the name shown in the report.
+        prepare (function): called as prepare(context, calls), returns the arguments of every call.
+        run (function): called as run(context, argument), the timed call.
+        cleanup (function): called as cleanup(context, arguments) after the calls, to restore the manager.
+        scan (bool): whether the operation reads every task, so it is called fewer times.
+    """
+
+    def __init__(self, name, prepare, run, cleanup=None, scan=False):
+        self.name = name
+        self.prepare = prepare
+        self.run = run
+        self.cleanup = cleanup
+        self.scan = scan
+
+
+class Context:
+    """
+    The state shared by the cases of one size.
+    """
+
+    def __init__(self, rows, seed, directory):
+        self.rows = rows
+        self.size = len(rows)
+        self.rng = random.Random(seed)
+        self.manager = TaskManager()
+        errors = self.manager.add_tasks(rows)
+        assert not errors, errors[:5]
+        self.dates = sorted({row[3] for row in rows if row[3]}) or ["01-01-2024"]
+        self.text_file = TaskFileManager(os.path.join(directory, "tasks.txt"))
+        self.binary_file = BinaryTaskFileManager(os.path.join(directory, "tasks.bin"))
+        self.text_file.save_tasks_to_file(self.manager.tasks)
+        self.binary_file.save_tasks_to_file(self.manager.tasks)
+
+    def random_ids(self, calls):
+        return [self.rng.randrange(self.size) for _ in range(calls)]
+
+    def random_dates(self, calls):
+        return [self.rng.choice(self.dates) for _ in range(calls)]
+
+
+def _new_rows(context, calls):
+    start = datetime(2024, 1, 1)
+    return [(context.size + i, f"New task {i}", context.rng.choice(TaskManager.PRIORITIES),
+             (start + timedelta(days=context.rng.randrange(730))).strftime("%d-%m-%Y"))
+            for i in range(calls)]
+
+
+def _removed_rows(context, calls):
+    task_ids = context.rng.sample(range(context.size), min(calls, context.size))
+    return [list(context.manager.get_task(task_id)) for task_id in task_ids]
+
+
+def _updates(context, calls):
+    # the old values are kept, so the cleanup can put every task back as it was
+    updates = []
+    for task_id, deadline_str in zip(context.random_ids(calls), context.random_dates(calls)):
+        task = context.manager.get_task(task_id)
+        old_values = {"priority": task[2], "deadline": task[3]}
+        updates.append((task_id, {"priority": context.rng.choice(TaskManager.PRIORITIES), "deadline": deadline_str},
+                        old_values))
+    return updates
+
+
+def _repeat(context, calls):
+    return [None] * calls
+
+
+CASES = [
+    Case("add_task", _new_rows, lambda c, row: c.manager.add_task(*row),
+         cleanup=lambda c, rows: c.manager.remove_tasks([row[0] for row in rows])),
+    Case("remove_task", _removed_rows, lambda c, row: c.manager.remove_task(row[0]),
+         cleanup=lambda c, rows: c.manager.add_tasks(rows)),
+    Case("update_task", _updates, lambda c, update: c.manager.update_task(update[0], update[1]),
+         cleanup=lambda c, updates: c.manager.update_tasks([(u[0], u[2]) for u in reversed(updates)])),
+    Case("get_task", lambda c, calls: c.random_ids(calls), lambda c, task_id: c.manager.get_task(task_id)),
+    Case("filter_tasks_by_deadline", lambda c, calls: c.random_dates(calls),
+         lambda c, date_str: c.manager.filter_tasks_by_deadline(date_str, "before")),
+    Case("find_task_by_deadline", lambda c, calls: c.random_dates(calls),
+         lambda c, date_str: c.manager.find_task_by_deadline(date_str)),
+    Case("find_task_by_priority", lambda c, calls: [c.rng.choice(TaskManager.PRIORITIES) for _ in range(calls)],
+         lambda c, priority: c.manager.find_task_by_priority(priority), scan=True),
+    Case("sort_tasks_by_deadline", _repeat, lambda c, _: c.manager.sort_tasks_by_deadline(), scan=True),
+    Case("sort_tasks_by_priority", _repeat, lambda c, _: c.manager.sort_tasks_by_priority(), scan=True),
+    Case("statistics.summary", _repeat, lambda c, _: c.manager.statistics.summary()),
+    Case("TaskStatistics.generate_task_summary", _repeat,
+         lambda c, _: TaskStatistics.generate_task_summary(c.manager.tasks), scan=True),
+    Case("save_tasks_to_file", _repeat, lambda c, _: c.text_file.save_tasks_to_file(c.manager.tasks), scan=True),
+    Case("load_tasks_from_file", _repeat, lambda c, _: c.text_file.load_tasks_from_file(), scan=True),
+    Case("binary save_tasks_to_file", _repeat,
+         lambda c, _: c.binary_file.save_tasks_to_file(c.manager.tasks), scan=True),
+    Case("binary load_tasks_from_file", _repeat, lambda c, _: c.binary_file.load_tasks_from_file(), scan=True),
+]
+
+
+def run_case(case, context, calls, memory_calls):
+    """
+    Times every call of a case, then repeats a few calls with tracemalloc on to find the
+    peak memory they allocate. tracemalloc slows allocations down, so it is kept out of the timing.
+    Returns:
+        dict: The measurements of the case.
+    """
+    arguments = case.prepare(context, calls)
+    latencies = []
+    for argument in arguments:
+        start = time.perf_counter_ns()
+        case.run(context, argument)
+        latencies.append(time.perf_counter_ns() - start)
+    if case.cleanup:
+        case.cleanup(context, arguments)
+
+    peak = None
+    if memory_calls:
+        arguments = case.prepare(context, memory_calls)
+        tracemalloc.start()
+        for argument in arguments:
+            case.run(context, argument)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        if case.cleanup:
+            case.cleanup(context, arguments)
+
+    # quantiles needs two samples, a single call is its own percentiles
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        "case": case.name,
+        "size": context.size,
+        "calls": len(latencies),
+        "ops_per_sec": len(latencies) / (sum(latencies) / 1e9),
+        "p50_us": quantiles[49] / 1000,
+        "p95_us": quantiles[94] / 1000,
+        "p99_us": quantiles[98] / 1000,
+        "peak_kib": None if peak is None else peak / 1024,
+    }
+
+
+def run_suite(args):
+    cases = [case for case in CASES if not args.cases or case.name in args.cases]
+    results = []
+    for size in args.sizes:
+        rows = generate_tasks(size, args.seed, args.priority_weights, args.deadline_days,
+                              args.skew, args.hot_dates, args.undated)
+        with tempfile.TemporaryDirectory() as directory:
+            context = Context(rows, args.seed, directory)
+            for case in cases:
+                calls = args.scan_calls if case.scan else args.calls
+                memory_calls = 0 if args.no_memory else min(calls, args.memory_calls)
+                result = run_case(case, context, calls, memory_calls)
+                results.append(result)
+                print_result(result)
+    return results
+
+
+def format_bytes(kib):
+    if kib is None:
+        return "-"
+    return f"{kib / 1024:,.1f} MiB" if kib >= 1024 else f"{kib:,.1f} KiB"
+
+
+def print_header():
+    print(f"{'case':<36} {'size':>9} {'ops/s':>12} {'p50 us':>10} {'p95 us':>10} {'p99 us':>10} {'peak':>12}")
+
+
+def print_result(result):
+    print(f"{result['case']:<36} {result['size']:>9} {result['ops_per_sec']:>12,.0f} {result['p50_us']:>10,.1f} "
+          f"{result['p95_us']:>10,.1f} {result['p99_us']:>10,.1f} {format_bytes(result['peak_kib']):>12}")
+
+
+def compare(baseline, results, threshold):
+    """
+    Prints the change of every case that is in both runs.
+    Returns:
+        list of str: The cases whose throughput or p95 latency got worse by more than threshold.
+    """
+    previous = {(result["case"], result["size"]): result for result in baseline["results"]}
+    regressions = []
+    print()
+    print(f"{'case':<36} {'size':>9} {'ops/s change':>13} {'p95 change':>11}")
+    for result in results:
+        before = previous.get((result["case"], result["size"]))
+        if before is None:
+            continue
+        throughput = result["ops_per_sec"] / before["ops_per_sec"] - 1
+        latency = result["p95_us"] / before["p95_us"] - 1 if before["p95_us"] else 0.0
+        regressed = throughput < -threshold or latency > threshold
+        if regressed:
+            regressions.append(f"{result['case']} ({result['size']})")
+        print(f"{result['case']:<36} {result['size']:>9} {throughput:>+13.1%} {latency:>+11.1%}"
+              f"{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--cases", nargs="+", choices=[case.name for case in CASES], help="run only these cases")
+    parser.add_argument("--calls", type=int, default=1000, help="calls per case for single-task operations")
+    parser.add_argument("--scan-calls", type=int, default=5, help="calls per case for operations reading every task")
+    parser.add_argument("--memory-calls", type=int, default=20, help="calls repeated under tracemalloc")
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory measurement")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--priority-weights", type=float, nargs=3, metavar=("LOW", "MEDIUM", "HIGH"))
+    parser.add_argument("--deadline-days", type=int, default=730, help="number of days the deadlines span")
+    parser.add_argument("--skew", type=float, default=0.0, help="share of the tasks due on a few hot dates")
+    parser.add_argument("--hot-dates", type=int, default=5)
+    parser.add_argument("--undated", type=float, default=0.0, help="share of the tasks without a deadline")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", help="compare with the results of an earlier run saved with --json")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative change reported as a regression. Defaults to 0.10")
+    args = parser.parse_args()
+
+    print_header()
+    results = run_suite(args)
+
+    if args.json:
+        report = {
+            "meta": {
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "options": {key: value for key, value in vars(args).items() if key not in ("json", "compare")},
+            },
+            "results": results,
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), results, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+import functools
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from task_manager import TaskManager, TaskQuery, parse_date
+
+
+class ReadWriteLock:
+    """
+    A lock that lets any number of readers in at the same time, or one writer.
+    Waiting writers go first, so a steady stream of readers cannot starve them.
+    The lock is reentrant: a thread holding it may take it again for reading or
+    writing, and the writer may also read, for example from a listener.
+    """
+
+    def __init__(self):
+        self.__condition = threading.Condition(threading.Lock())
+        self.__readers = 0
+        self.__writer = None
+        self.__write_depth = 0
+        self.__waiting_writers = 0
+        self.__local = threading.local()
+
+    @contextmanager
+    def read(self):
+        thread_id = threading.get_ident()
+        depth = getattr(self.__local, "read_depth", 0)
+        if self.__writer == thread_id or depth:
+            self.__local.read_depth = depth + 1
+            try:
+                yield
+            finally:
+                self.__local.read_depth = depth
+            return
+
+        with self.__condition:
+            while self.__writer is not None or self.__waiting_writers:
+                self.__condition.wait()
+            self.__readers += 1
+        self.__local.read_depth = 1
+        try:
+            yield
+        finally:
+            self.__local.read_depth = 0
+            with self.__condition:
+                self.__readers -= 1
+                if not self.__readers:
+                    self.__condition.notify_all()
+
+    @contextmanager
+    def write(self):
+        thread_id = threading.get_ident()
+        if self.__writer == thread_id:
+            self.__write_depth += 1
+            try:
+                yield
+            finally:
+                self.__write_depth -= 1
+            return
+        if getattr(self.__local, "read_depth", 0):
+            raise RuntimeError("Cannot take the write lock while holding the read lock.")
+
+        with self.__condition:
+            self.__waiting_writers += 1
+            while self.__writer is not None or self.__readers:
+                self.__condition.wait()
+            self.__waiting_writers -= 1
+            self.__writer = thread_id
+        try:
+            yield
+        finally:
+            with self.__condition:
+                self.__writer = None
+                self.__condition.notify_all()
+
+
+def _reading(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock.read():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _reading_all(method):
+    # lazy results are collected while the lock is held, so they cannot see a write half done
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock.read():
+            return iter(list(method(self, *args, **kwargs)))
+    return wrapper
+
+
+def _writing(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock.write():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _parse_early(deadline):
+    """
+    Parses a deadline before the write lock is taken. Invalid values are returned unchanged,
+    so TaskManager still raises or reports its usual error for them.
+    """
+    if isinstance(deadline, str):
+        try:
+            return parse_date(deadline)
+        except ValueError:
+            pass
+    return deadline
+
+
+def _parse_row_early(row):
+    if isinstance(row, (list, tuple)) and len(row) in (4, 5):
+        return (*row[:3], _parse_early(row[3]), *row[4:])
+    return row
+
+
+def _parse_update_early(update):
+    if isinstance(update, (list, tuple)) and len(update) == 2 and isinstance(update[1], dict) \
+            and "deadline" in update[1]:
+        return update[0], dict(update[1], deadline=_parse_early(update[1]["deadline"]))
+    return update
+
+
+class ConcurrentTaskQuery(TaskQuery):
+    """
+    A TaskQuery that collects its results under the manager's read lock.
+    """
+
+    def __iter__(self):
+        with self.manager.lock.read():
+            return iter(list(super().__iter__()))
+
+
+class ConcurrentTaskManager(TaskManager):
+    """
+    A TaskManager that can be shared between threads. Reads hold a shared lock, so they run
+    together and always see a consistent state, and writes are serialized by an exclusive lock.
+    Dates are parsed before the write lock is taken, to keep it held as briefly as possible.
+    Listeners are called while the write lock is held.
+    Reads return the manager's own task records, which update_task changes in place once the
+    read lock is released. A caller that needs the fields to stay as they were read should copy
+    the tasks while holding the lock, for example [list(task) for task in ...] inside lock.read().
+    Attributes:
+        lock (ReadWriteLock): the lock guarding the tasks and their indexes.
+    """
+
+    def __init__(self, compact=False, text_index=False):
+        self.lock = ReadWriteLock()
+        super().__init__(compact=compact, text_index=text_index)
+
+    tasks = property(_reading(TaskManager.tasks.fget))
+
+    def add_task(self, task_id, description, priority, deadline_str, completed=False):
+        deadline = _parse_early(deadline_str)
+        with self.lock.write():
+            return super().add_task(task_id, description, priority, deadline, completed)
+
+    def update_task(self, task_id, updated_task):
+        if "deadline" in updated_task:
+            updated_task = dict(updated_task, deadline=_parse_early(updated_task["deadline"]))
+        with self.lock.write():
+            return super().update_task(task_id, updated_task)
+
+    def add_tasks(self, tasks):
+        rows = [_parse_row_early(row) for row in tasks]
+        with self.lock.write():
+            return super().add_tasks(rows)
+
+    def update_tasks(self, updates):
+        if isinstance(updates, dict):
+            updates = updates.items()
+        updates = [_parse_update_early(update) for update in updates]
+        with self.lock.write():
+            return super().update_tasks(updates)
+
+    add_task_runs = _writing(TaskManager.add_task_runs)
+    remove_task = _writing(TaskManager.remove_task)
+    remove_tasks = _writing(TaskManager.remove_tasks)
+    add_listener = _writing(TaskManager.add_listener)
+    add_view = _writing(TaskManager.add_view)
+    remove_view = _writing(TaskManager.remove_view)
+    remove_listener = _writing(TaskManager.remove_listener)
+
+    get_task = _reading(TaskManager.get_task)
+    filter_tasks_by_deadline = _reading(TaskManager.filter_tasks_by_deadline)
+    tasks_between = _reading(TaskManager.tasks_between)
+    tasks_before = _reading(TaskManager.tasks_before)
+    tasks_after = _reading(TaskManager.tasks_after)
+    tasks_on = _reading(TaskManager.tasks_on)
+    tasks_without_deadline = _reading(TaskManager.tasks_without_deadline)
+    page_tasks_by_deadline = _reading(TaskManager.page_tasks_by_deadline)
+    page_tasks_by_priority = _reading(TaskManager.page_tasks_by_priority)
+    search_tasks = _reading(TaskManager.search_tasks)
+    sort_tasks_by_deadline = _reading(TaskManager.sort_tasks_by_deadline)
+    sort_tasks_by_priority = _reading(TaskManager.sort_tasks_by_priority)
+    find_task_by_deadline = _reading(TaskManager.find_task_by_deadline)
+    find_task_by_priority = _reading(TaskManager.find_task_by_priority)
+    most_urgent_tasks = _reading(TaskManager.most_urgent_tasks)
+    iter_tasks_by_deadline = _reading_all(TaskManager.iter_tasks_by_deadline)
+    iter_tasks_by_priority = _reading_all(TaskManager.iter_tasks_by_priority)
+
+    def query(self):
+        return ConcurrentTaskQuery(self)
+
+    def summary(self, today=None):
+        """
+        Reads the statistics. The overdue count caches its last answer, so this takes the write lock.
+        Args:
+            today (datetime, optional): the current date. Defaults to datetime.now().
+        Returns:
+            dict: The same counts as TaskCounters.summary.
+        """
+        with self.lock.write():
+            return self.statistics.summary(today or datetime.now())
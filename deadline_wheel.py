@@ -0,0 +1,166 @@
+from datetime import date, datetime
+
+
+class DeadlineWheel:
+    """
+    Raises events when the deadlines of a TaskManager's tasks come close or pass, using a
+    hierarchical timing wheel: timers due this week sit in one bucket per day, timers due
+    within five weeks in one bucket per week, and later timers in one bucket per month. When
+    the wheel reaches a new month or week, that bucket is spread over the finer buckets, so
+    every timer is moved at most twice and a tick only touches the timers that fire or move.
+    The wheel follows the manager's changes through a listener.
+    Events:
+        "due_soon": the deadline is lookahead_days or fewer days away.
+        "overdue": the deadline has passed, so the task is due before today.
+    Attributes:
+        manager (TaskManager): the watched task manager.
+        lookahead_days (int or None): how many days before the deadline "due_soon" fires, None for no "due_soon" events.
+        pending_only (bool): whether completed tasks are left out.
+    """
+
+    DAYS_PER_WEEK = 7
+    WEEK_HORIZON = 35
+
+    def __init__(self, manager, lookahead_days=3, today=None, pending_only=True):
+        self.manager = manager
+        self.lookahead_days = lookahead_days
+        self.pending_only = pending_only
+        # the last day processed, timers firing on it or before it are due
+        self.__today = (today or datetime.now()).toordinal()
+        self.__month = self.__month_of(self.__today)
+        self.__days = {}
+        self.__weeks = {}
+        self.__months = {}
+        self.__due = set()
+        # timers are (fire day ordinal, task_id, event) tuples
+        self.__bucket_of = {}
+        self.__timers_of = {}
+        self.__deadline_of = {}
+        self.__callbacks = []
+        for task in manager.tasks:
+            self.__schedule(task)
+        manager.add_listener(self.__on_change)
+
+    @staticmethod
+    def __month_of(ordinal):
+        day = date.fromordinal(ordinal)
+        return day.year, day.month
+
+    def __week_of(self, ordinal):
+        # ordinal 1 is a Monday, so weeks run from Monday to Sunday
+        return (ordinal - 1) // self.DAYS_PER_WEEK
+
+    def __place(self, timer):
+        fire_day = timer[0]
+        if fire_day <= self.__today:
+            bucket = self.__due
+        elif self.__week_of(fire_day) == self.__week_of(self.__today):
+            bucket = self.__days.setdefault(fire_day, set())
+        elif fire_day - self.__today < self.WEEK_HORIZON:
+            bucket = self.__weeks.setdefault(self.__week_of(fire_day), set())
+        else:
+            bucket = self.__months.setdefault(self.__month_of(fire_day), set())
+        bucket.add(timer)
+        self.__bucket_of[timer] = bucket
+
+    def __schedule(self, task):
+        task_id, deadline = task[0], task[3]
+        if deadline is None or (self.pending_only and task[4]):
+            return
+        deadline_day = deadline.toordinal()
+        self.__deadline_of[task_id] = deadline_day
+        timers = [(deadline_day + 1, task_id, "overdue")]
+        # a task that is already overdue only gets its "overdue" event
+        if self.lookahead_days is not None and deadline_day >= self.__today:
+            timers.append((deadline_day - self.lookahead_days, task_id, "due_soon"))
+        self.__timers_of[task_id] = timers
+        for timer in timers:
+            self.__place(timer)
+
+    def __unschedule(self, task_id):
+        self.__deadline_of.pop(task_id, None)
+        for timer in self.__timers_of.pop(task_id, ()):
+            bucket = self.__bucket_of.pop(timer, None)
+            if bucket is not None:
+                bucket.discard(timer)
+
+    def __on_change(self, action, task):
+        task_id = task[0]
+        if action == "update":
+            scheduled = task[3] is not None and not (self.pending_only and task[4])
+            deadline_day = task[3].toordinal() if task[3] else None
+            if scheduled and self.__deadline_of.get(task_id) == deadline_day:
+                # the deadline did not move, so the timers and the events already raised stay
+                return
+        self.__unschedule(task_id)
+        if action != "remove":
+            self.__schedule(task)
+
+    def __cascade(self, timers):
+        for timer in timers:
+            self.__place(timer)
+
+    def add_callback(self, callback):
+        """
+        Registers a function called for every event raised by advance.
+        Args:
+            callback (function): Called as callback(event, task), where event is "due_soon" or "overdue".
+        """
+        self.__callbacks.append(callback)
+
+    def remove_callback(self, callback):
+        """
+        Unregisters a function added with add_callback.
+        Args:
+            callback (function): The function to remove.
+        """
+        self.__callbacks.remove(callback)
+
+    def advance(self, today=None):
+        """
+        Moves the wheel forward to today and raises the events of the days that passed.
+        The first call also raises "overdue" for tasks that were overdue when the wheel was created.
+        Args:
+            today (datetime, optional): the current date. Defaults to datetime.now().
+        Returns:
+            list of tuple: (event, task) for every event raised, in the order of their days.
+        """
+        target = (today or datetime.now()).toordinal()
+        while self.__today < target:
+            self.__today += 1
+            month = self.__month_of(self.__today)
+            if month != self.__month:
+                self.__month = month
+                self.__cascade(self.__months.pop(month, ()))
+            if (self.__today - 1) % self.DAYS_PER_WEEK == 0:
+                self.__cascade(self.__weeks.pop(self.__week_of(self.__today), ()))
+            self.__cascade(self.__days.pop(self.__today, ()))
+
+        fired = sorted(self.__due)
+        self.__due = set()
+        events = []
+        for timer in fired:
+            _, task_id, event = timer
+            del self.__bucket_of[timer]
+            timers = self.__timers_of[task_id]
+            timers.remove(timer)
+            if not timers:
+                del self.__timers_of[task_id]
+            events.append((event, self.manager.get_task(task_id)))
+        for event, task in events:
+            for callback in self.__callbacks:
+                callback(event, task)
+        return events
+
+    def upcoming(self):
+        """
+        Returns:
+            int: The number of events still to be raised.
+        """
+        return len(self.__bucket_of)
+
+    def close(self):
+        """
+        Stops following the manager's changes.
+        """
+        self.manager.remove_listener(self.__on_change)
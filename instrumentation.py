@@ -0,0 +1,222 @@
+import functools
+import json
+import threading
+import time
+from collections import deque
+
+from task_manager import BinaryTaskFileManager, TaskCounters, TaskFileManager, TaskManager, TaskStatistics
+
+DEFAULT_CLASSES = (TaskManager, TaskFileManager, BinaryTaskFileManager, TaskStatistics, TaskCounters)
+
+# private methods worth timing, by their mangled names
+INTERNAL_METHODS = {
+    TaskManager: ("_TaskManager__rebuild_indexes",),
+}
+
+
+def _result_size(result):
+    """
+    Returns the number of items of a result that is a collection of tasks, rows or errors,
+    or None for any other result. A task is itself a list, so lists starting with an ID are skipped.
+    """
+    if isinstance(result, tuple) and len(result) == 2 and isinstance(result[0], list):
+        # a page and its cursor
+        result = result[0]
+    if isinstance(result, list) and not (result and isinstance(result[0], int)):
+        return len(result)
+    return None
+
+
+class MethodStats:
+    """
+    Measurements of one instrumented method.
+    Attributes:
+        calls (int): number of calls.
+        errors (int): number of calls that raised an exception.
+        total_seconds (float): time spent in all calls, including the methods they call.
+        max_seconds (float): the slowest call.
+        samples (deque): the latencies of the most recent calls, used for the percentiles.
+        result_size_total (int): sum of the number of items returned, for methods returning lists.
+        result_size_max (int): the largest number of items returned by one call.
+    """
+
+    def __init__(self, sample_size):
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.samples = deque(maxlen=sample_size)
+        self.result_size_total = 0
+        self.result_size_max = 0
+
+    def percentile(self, p):
+        """
+        Args:
+            p (float): the percentile, between 0 and 100.
+        Returns:
+            float: The latency in seconds below which p percent of the recent calls finished, 0.0 without calls.
+        """
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+    def to_dict(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_seconds": self.total_seconds,
+            "mean_seconds": self.total_seconds / self.calls if self.calls else 0.0,
+            "p50_seconds": self.percentile(50),
+            "p95_seconds": self.percentile(95),
+            "p99_seconds": self.percentile(99),
+            "max_seconds": self.max_seconds,
+            "result_size_total": self.result_size_total,
+            "result_size_max": self.result_size_max,
+        }
+
+
+class Instrumentation:
+    """
+    Opt-in timing of the task manager classes. enable() replaces their methods with timed
+    wrappers and disable() puts the original methods back, so there is no overhead at all
+    while instrumentation is off. Times include the methods called from inside a method,
+    and lazy methods are timed until they return their iterator.
+    Attributes:
+        classes (tuple): the instrumented classes.
+        sample_size (int): number of recent calls per method kept for the percentiles.
+        stats (dict): MethodStats keyed by "Class.method".
+    """
+
+    def __init__(self, classes=DEFAULT_CLASSES, sample_size=1024):
+        self.classes = tuple(classes)
+        self.sample_size = sample_size
+        self.stats = {}
+        self.__originals = []
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def __method_names(cls):
+        names = []
+        for name, value in vars(cls).items():
+            if name.startswith("_") or isinstance(value, type):
+                continue
+            if isinstance(value, (staticmethod, classmethod)) or callable(value):
+                names.append(name)
+        return names + [name for name in INTERNAL_METHODS.get(cls, ()) if name in vars(cls)]
+
+    def __record(self, name, seconds, result, failed):
+        with self.__lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = MethodStats(self.sample_size)
+            stats.calls += 1
+            stats.errors += failed
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.samples.append(seconds)
+            size = _result_size(result)
+            if size is not None:
+                stats.result_size_total += size
+                stats.result_size_max = max(stats.result_size_max, size)
+
+    def __wrap(self, name, function):
+        record = self.__record
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = function(*args, **kwargs)
+            except BaseException:
+                record(name, time.perf_counter() - start, None, True)
+                raise
+            record(name, time.perf_counter() - start, result, False)
+            return result
+        return wrapper
+
+    @property
+    def enabled(self):
+        return bool(self.__originals)
+
+    def enable(self):
+        """
+        Starts timing the methods of the classes. Does nothing if already enabled.
+        """
+        if self.enabled:
+            return
+        for cls in self.classes:
+            for attribute in self.__method_names(cls):
+                original = vars(cls)[attribute]
+                name = f"{cls.__name__}.{attribute.replace(f'_{cls.__name__}__', '__')}"
+                if isinstance(original, (staticmethod, classmethod)):
+                    replacement = type(original)(self.__wrap(name, original.__func__))
+                else:
+                    replacement = self.__wrap(name, original)
+                self.__originals.append((cls, attribute, original))
+                setattr(cls, attribute, replacement)
+
+    def disable(self):
+        """
+        Puts the original methods back. The measurements are kept.
+        """
+        for cls, attribute, original in reversed(self.__originals):
+            setattr(cls, attribute, original)
+        self.__originals = []
+
+    def reset(self):
+        """
+        Clears the measurements.
+        """
+        with self.__lock:
+            self.stats = {}
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: The measurements of every method called so far, keyed by "Class.method".
+        """
+        with self.__lock:
+            return {name: stats.to_dict() for name, stats in sorted(self.stats.items())}
+
+    def to_json(self, indent=None):
+        """
+        Returns:
+            str: The snapshot as JSON.
+        """
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self, prefix="task_manager"):
+        """
+        Formats the measurements in the Prometheus text exposition format, with the
+        latencies as a summary.
+        Args:
+            prefix (str, optional): prefix of the metric names. Defaults to "task_manager".
+        Returns:
+            str: The metrics, one sample per line.
+        """
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {prefix}_call_seconds Latency of task manager method calls.",
+            f"# TYPE {prefix}_call_seconds summary",
+        ]
+        for name, stats in snapshot.items():
+            for quantile, key in (("0.5", "p50_seconds"), ("0.95", "p95_seconds"), ("0.99", "p99_seconds")):
+                lines.append(f'{prefix}_call_seconds{{method="{name}",quantile="{quantile}"}} {stats[key]!r}')
+            lines.append(f'{prefix}_call_seconds_sum{{method="{name}"}} {stats["total_seconds"]!r}')
+            lines.append(f'{prefix}_call_seconds_count{{method="{name}"}} {stats["calls"]}')
+        for metric, key, help_text in (
+                ("errors_total", "errors", "Calls that raised an exception."),
+                ("result_size_total", "result_size_total", "Sum of the lengths of returned collections.")):
+            lines.append(f"# HELP {prefix}_{metric} {help_text}")
+            lines.append(f"# TYPE {prefix}_{metric} counter")
+            for name, stats in snapshot.items():
+                lines.append(f'{prefix}_{metric}{{method="{name}"}} {stats[key]}')
+        return "\n".join(lines) + "\n"
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.disable()
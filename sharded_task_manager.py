@@ -0,0 +1,403 @@
+import heapq
+import itertools
+import multiprocessing
+from collections.abc import Iterator
+from datetime import datetime
+
+from task_manager import TaskManager
+
+
+def _call(manager, name, args, kwargs):
+    """
+    Calls a method of a shard by name, for example "tasks_on" or "statistics.summary".
+    With args None the attribute itself is returned, which is how properties are read.
+    Lazy results are collected, so they can be merged or sent to another process.
+    """
+    target = manager
+    for part in name.split("."):
+        target = getattr(target, part)
+    result = target if args is None else target(*args, **kwargs)
+    return list(result) if isinstance(result, Iterator) else result
+
+
+def _serve_shard(connection, compact, text_index):
+    """
+    Runs one shard in a worker process, answering requests until it receives None.
+    """
+    manager = TaskManager(compact=compact, text_index=text_index)
+    while True:
+        request = connection.recv()
+        if request is None:
+            break
+        try:
+            result = _call(manager, *request)
+        except Exception as e:
+            connection.send((False, e))
+        else:
+            connection.send((True, result))
+    connection.close()
+
+
+class _LocalShard:
+    """
+    A shard in the current process. Requests are answered as soon as they are sent.
+    """
+
+    def __init__(self, compact, text_index):
+        self.manager = TaskManager(compact=compact, text_index=text_index)
+        self.__reply = None
+
+    def send(self, name, args=(), kwargs=None):
+        try:
+            self.__reply = (True, _call(self.manager, name, args, kwargs or {}))
+        except Exception as e:
+            self.__reply = (False, e)
+
+    def receive(self):
+        ok, result = self.__reply
+        self.__reply = None
+        if not ok:
+            raise result
+        return result
+
+    def close(self):
+        pass
+
+
+class _ProcessShard:
+    """
+    A shard in a worker process. Requests sent to several shards before their replies
+    are received are answered by the workers in parallel.
+    """
+
+    def __init__(self, compact, text_index):
+        self.__connection, worker_connection = multiprocessing.Pipe()
+        self.__process = multiprocessing.Process(
+            target=_serve_shard, args=(worker_connection, compact, text_index), daemon=True)
+        self.__process.start()
+        worker_connection.close()
+
+    def send(self, name, args=(), kwargs=None):
+        self.__connection.send((name, args, kwargs or {}))
+
+    def receive(self):
+        ok, result = self.__connection.recv()
+        if not ok:
+            raise result
+        return result
+
+    def close(self):
+        self.__connection.send(None)
+        self.__process.join()
+        self.__connection.close()
+
+
+class ShardedTaskManager:
+    """
+    Spreads tasks over several independent TaskManager shards by a hash of their ID. Operations
+    on one task go to its shard only. Queries are sent to every shard, and since every shard
+    returns its tasks already sorted, the answers are combined with a k-way merge.
+    With processes=True every shard runs in its own worker process, so shards work on a query
+    in parallel and the tasks returned are copies: change them through update_task.
+    Listeners and TaskQuery are not supported across shards.
+    Attributes:
+        shard_count (int): number of shards.
+        compact (bool): whether the shards store CompactTask records.
+    """
+
+    PRIORITIES = TaskManager.PRIORITIES
+
+    def __init__(self, shards=4, processes=False, compact=False, text_index=False):
+        if shards < 1:
+            raise ValueError("There must be at least one shard.")
+        self.shard_count = shards
+        self.compact = compact
+        shard_class = _ProcessShard if processes else _LocalShard
+        self.__shards = [shard_class(compact, text_index) for _ in range(shards)]
+        # an empty manager of the same mode supplies the sort keys the shards use
+        keys = TaskManager(compact=compact)
+        self.__deadline_key = keys.tasks_by_deadline.key
+        self.__priority_key = keys.tasks_by_priority.key
+
+    def __shard_of(self, task_id):
+        return self.__shards[hash(task_id) % self.shard_count]
+
+    def __call_one(self, task_id, name, *args):
+        shard = self.__shard_of(task_id)
+        shard.send(name, args)
+        return shard.receive()
+
+    def __call_all(self, name, *args, **kwargs):
+        """
+        Sends a request to every shard, then collects the replies, so process shards
+        work on it at the same time.
+        Returns:
+            list: The reply of every shard.
+        """
+        for shard in self.__shards:
+            shard.send(name, args, kwargs)
+        return self.__receive_all()
+
+    def __receive_all(self):
+        # every reply is read before raising, so no reply is left behind in a pipe
+        replies = []
+        error = None
+        for shard in self.__shards:
+            try:
+                replies.append(shard.receive())
+            except Exception as e:
+                error = error or e
+        if error is not None:
+            raise error
+        return replies
+
+    def __call_batch(self, name, rows, task_id_of):
+        """
+        Sends every row of a batch to the shard of its task and reports the errors of the
+        shards by their position in the original rows.
+        Returns:
+            list of tuple: (row index, error message) for every row that was rejected.
+        """
+        errors = []
+        row_indexes = [[] for _ in self.__shards]
+        shard_rows = [[] for _ in self.__shards]
+        for row_index, row in enumerate(rows):
+            try:
+                shard_index = hash(task_id_of(row)) % self.shard_count
+            except (TypeError, IndexError, KeyError):
+                # a malformed row is left to the first shard, which reports it like TaskManager does
+                shard_index = 0
+            row_indexes[shard_index].append(row_index)
+            shard_rows[shard_index].append(row)
+
+        for shard, rows_of_shard in zip(self.__shards, shard_rows):
+            shard.send(name, (rows_of_shard,))
+        for indexes, shard_errors in zip(row_indexes, self.__receive_all()):
+            errors.extend((indexes[local_index], message) for local_index, message in shard_errors)
+        errors.sort()
+        return errors
+
+    def __merge(self, results, key, reverse=False):
+        return heapq.merge(*results, key=key, reverse=reverse)
+
+    def add_task(self, task_id, description, priority, deadline_str, completed=False):
+        """
+        Adds a new task to its shard. See TaskManager.add_task.
+        Raises:
+            ValueError: If the priority is invalid, the date format is incorrect or task ID already exists.
+        """
+        return self.__call_one(task_id, "add_task", task_id, description, priority, deadline_str, completed)
+
+    def remove_task(self, task_id):
+        """
+        Removes a task. See TaskManager.remove_task.
+        Returns:
+            str: A message if the task was not found.
+        """
+        return self.__call_one(task_id, "remove_task", task_id)
+
+    def update_task(self, task_id, updated_task):
+        """
+        Updates a task. See TaskManager.update_task.
+        Raises:
+            ValueError: If any of the keys are invalid or the date format is incorrect.
+        Returns:
+            str: A message if the task was not found.
+        """
+        return self.__call_one(task_id, "update_task", task_id, updated_task)
+
+    def get_task(self, task_id):
+        """
+        Get task by its ID.
+        Returns:
+            list or str: The task details as a list, or a message if the task is not found.
+        """
+        return self.__call_one(task_id, "get_task", task_id)
+
+    def add_tasks(self, tasks):
+        """
+        Adds many tasks at once, every shard adding its own rows. See TaskManager.add_tasks.
+        Returns:
+            list of tuple: (row index, error message) for every row that was not added.
+        """
+        return self.__call_batch("add_tasks", tasks, lambda row: row[0])
+
+    def remove_tasks(self, task_ids):
+        """
+        Removes many tasks at once. See TaskManager.remove_tasks.
+        Returns:
+            list of tuple: (row index, error message) for every ID that was not found.
+        """
+        return self.__call_batch("remove_tasks", task_ids, lambda task_id: task_id)
+
+    def update_tasks(self, updates):
+        """
+        Updates many tasks at once. See TaskManager.update_tasks.
+        Returns:
+            list of tuple: (row index, error message) for every update that was not applied.
+        """
+        if isinstance(updates, dict):
+            updates = updates.items()
+        return self.__call_batch("update_tasks", updates, lambda update: update[0])
+
+    @property
+    def tasks(self):
+        for shard in self.__shards:
+            shard.send("tasks", None)
+        return list(itertools.chain.from_iterable(self.__receive_all()))
+
+    def filter_tasks_by_deadline(self, date_str, filter_type='before'):
+        """
+        Filters tasks based on their deadlines. See TaskManager.filter_tasks_by_deadline.
+        Returns:
+            list: A list of tasks that match the filter criteria.
+        """
+        results = self.__call_all("filter_tasks_by_deadline", date_str, filter_type)
+        return list(self.__merge(results, self.__deadline_key))
+
+    def tasks_between(self, start, end, include_start=True, include_end=True):
+        """
+        Finds tasks with deadlines between two dates. See TaskManager.tasks_between.
+        Returns:
+            list: The matching tasks sorted by deadline.
+        """
+        results = self.__call_all("tasks_between", start, end, include_start, include_end)
+        return list(self.__merge(results, self.__deadline_key))
+
+    def tasks_before(self, date_str, inclusive=False):
+        return self.tasks_between(None, date_str, include_end=inclusive)
+
+    def tasks_after(self, date_str, inclusive=False):
+        return self.tasks_between(date_str, None, include_start=inclusive)
+
+    def tasks_on(self, date_str):
+        return self.tasks_between(date_str, date_str)
+
+    def tasks_without_deadline(self):
+        """
+        Returns:
+            list: The tasks without a deadline sorted by task ID.
+        """
+        return list(self.__merge(self.__call_all("tasks_without_deadline"), self.__deadline_key))
+
+    def iter_tasks_by_deadline(self, ascending=True, offset=0, limit=None, formatted=False):
+        """
+        Yields the tasks with a deadline in deadline order. Every shard sends only the first
+        offset + limit of its tasks, since no task past them can be part of the result.
+        Returns:
+            iterator: The tasks, or their formatted rows.
+        """
+        count = None if limit is None else offset + limit
+        results = self.__call_all("iter_tasks_by_deadline", ascending, 0, count)
+        tasks = itertools.islice(self.__merge(results, self.__deadline_key, not ascending), offset, count)
+        return map(TaskManager.format_deadline_row, tasks) if formatted else tasks
+
+    def iter_tasks_by_priority(self, ascending=True, offset=0, limit=None, formatted=False):
+        """
+        Yields the tasks in priority order. Every shard sends only the first offset + limit of its tasks.
+        Returns:
+            iterator: The tasks, or their formatted rows.
+        """
+        count = None if limit is None else offset + limit
+        results = self.__call_all("iter_tasks_by_priority", ascending, 0, count)
+        tasks = itertools.islice(self.__merge(results, self.__priority_key, not ascending), offset, count)
+        return map(TaskManager.format_priority_row, tasks) if formatted else tasks
+
+    def __page(self, name, key, limit, cursor, ascending):
+        pages = self.__call_all(name, limit, cursor, ascending)
+        merged = list(itertools.islice(self.__merge([page for page, _ in pages], key, not ascending), limit + 1))
+        has_more = len(merged) > limit or any(next_cursor is not None for _, next_cursor in pages)
+        page = merged[:limit]
+        return page, key(page[-1]) if page and has_more else None
+
+    def page_tasks_by_deadline(self, limit=50, cursor=None, ascending=True):
+        """
+        Returns one page of tasks with a deadline, in deadline order. See TaskManager.page_tasks_by_deadline.
+        Returns:
+            tuple: (list of tasks, cursor of the next page or None if this is the last page).
+        """
+        return self.__page("page_tasks_by_deadline", self.__deadline_key, limit, cursor, ascending)
+
+    def page_tasks_by_priority(self, limit=50, cursor=None, ascending=True):
+        """
+        Returns one page of tasks in priority order. See TaskManager.page_tasks_by_priority.
+        Returns:
+            tuple: (list of tasks, cursor of the next page or None if this is the last page).
+        """
+        return self.__page("page_tasks_by_priority", self.__priority_key, limit, cursor, ascending)
+
+    def search_tasks(self, query, mode="and", prefix=False, priority=None, completed=None, before=None, after=None):
+        """
+        Searches task descriptions for words. See TaskManager.search_tasks.
+        Returns:
+            list: The matching tasks sorted by deadline.
+        """
+        results = self.__call_all("search_tasks", query, mode, prefix, priority, completed, before, after)
+        return list(self.__merge(results, self.__deadline_key))
+
+    def sort_tasks_by_deadline(self, ascending=True):
+        """
+        Sorts tasks by their deadlines.
+        Returns:
+            str: A formatted string of the sorted tasks with deadlines.
+        """
+        rows = list(self.iter_tasks_by_deadline(ascending, formatted=True))
+        if not rows:
+            return "No tasks to sort."
+        return "Sorted tasks with valid deadlines:\n" + "\n".join(rows)
+
+    def sort_tasks_by_priority(self, ascending=True):
+        """
+        Sorts the tasks by priority.
+        Returns:
+            list of str: A list of strings, each string is a task
+        """
+        return list(self.iter_tasks_by_priority(ascending, formatted=True))
+
+    def find_task_by_deadline(self, date_str):
+        return self.tasks_on(date_str)
+
+    def find_task_by_priority(self, priority):
+        """
+        Finds the tasks with a priority. See TaskManager.find_task_by_priority.
+        Returns:
+            list of list: A list of tasks sorted by deadline, tasks without a deadline last.
+        """
+        return list(self.__merge(self.__call_all("find_task_by_priority", priority), self.__deadline_key))
+
+    def most_urgent_tasks(self, priority, k, pending_only=True):
+        """
+        Finds the k tasks of a priority with the earliest deadlines. Every shard sends its own k.
+        Returns:
+            list of list: Up to k tasks sorted by deadline.
+        """
+        results = self.__call_all("most_urgent_tasks", priority, k, pending_only)
+        return list(itertools.islice(self.__merge(results, self.__deadline_key), k))
+
+    def summary(self, today=None):
+        """
+        Adds up the statistics of every shard.
+        Args:
+            today (datetime, optional): the current date. Defaults to datetime.now().
+        Returns:
+            dict: The same counts as TaskCounters.summary.
+        """
+        summaries = self.__call_all("statistics.summary", today or datetime.now())
+        total = {key: sum(summary[key] for summary in summaries)
+                 for key in ("total", "completed", "pending", "overdue")}
+        total["by_priority"] = {priority: sum(summary["by_priority"][priority] for summary in summaries)
+                                for priority in self.PRIORITIES}
+        return total
+
+    def close(self):
+        """
+        Stops the worker processes of the shards.
+        """
+        for shard in self.__shards:
+            shard.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,560 @@
+import sqlite3
+from datetime import datetime
+
+from task_manager import TaskManager, parse_deadline
+
+# undated tasks are stored with a deadline after every real one, so they sort last like in TaskManager
+NO_DEADLINE = datetime.max.toordinal() + 1
+# SQLite dates are Julian day numbers, this turns a date ordinal into one
+JULIAN_DAY_OFFSET = 1721424.5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    description TEXT,
+    priority INTEGER NOT NULL,
+    deadline INTEGER NOT NULL,
+    completed INTEGER NOT NULL
+);
+-- like the indexes of TaskManager; every index ends with the rowid, so ties are ordered by task ID
+CREATE INDEX IF NOT EXISTS tasks_by_deadline ON tasks (deadline);
+CREATE INDEX IF NOT EXISTS tasks_by_priority ON tasks (priority);
+CREATE INDEX IF NOT EXISTS priority_buckets ON tasks (priority, deadline);
+CREATE INDEX IF NOT EXISTS tasks_by_completed ON tasks (completed, deadline);
+"""
+
+TASK_COLUMNS = "id, description, priority, deadline, completed"
+# a missing description is shown as None, like Python's string formatting does
+DEADLINE_ROW = (f"'Task ID: ' || id || ', Description: ' || ifnull(description, 'None') || ', Deadline: ' || "
+                f"strftime('%d-%m-%Y', deadline + {JULIAN_DAY_OFFSET})")
+PRIORITY_ROW = ("'Task ID: ' || id || ', Description: ' || ifnull(description, 'None') || ', Priority: ' || "
+                "{priority_name}")
+
+
+class SQLiteTaskManager:
+    """
+    A task manager that keeps its tasks in an SQLite database instead of in memory, with the
+    same public methods as TaskManager. The deadline, priority and completed columns are
+    indexed, filters and sorting run in SQL, and only the tasks asked for are read into Python.
+    File databases use WAL mode, so readers are not blocked by a write in progress.
+    Tasks are returned as [task_id, description, priority, deadline, completed] lists; they are
+    copies, so change them through update_task. Task IDs must be integers.
+    Attributes:
+        database (str): the database file, or ":memory:".
+        batch_size (int): number of rows written per statement by the batch methods.
+    """
+
+    PRIORITIES = TaskManager.PRIORITIES
+
+    def __init__(self, database=":memory:", batch_size=10000):
+        self.database = database
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(database)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.__rank = {priority: rank for rank, priority in enumerate(self.PRIORITIES)}
+        self.__priority_name = "CASE priority " + " ".join(
+            f"WHEN {rank} THEN '{priority}'" for rank, priority in enumerate(self.PRIORITIES)) + " END"
+        self.__listeners = []
+
+    def __validate_priority(self, priority):
+        if priority not in self.PRIORITIES:
+            raise ValueError(f"Invalid priority. Must be one of {', '.join(self.PRIORITIES)}.")
+
+    @staticmethod
+    def __ordinal(deadline):
+        return deadline.toordinal() if deadline else NO_DEADLINE
+
+    def __day(self, date_str):
+        return parse_deadline(date_str).toordinal()
+
+    def __to_task(self, row):
+        task_id, description, rank, deadline, completed = row
+        deadline = datetime.fromordinal(deadline) if deadline != NO_DEADLINE else None
+        return [task_id, description, self.PRIORITIES[rank], deadline, bool(completed)]
+
+    def __select(self, where="1", parameters=(), order="deadline, id", limit=None, offset=0):
+        sql = f"SELECT {TASK_COLUMNS} FROM tasks WHERE {where} ORDER BY {order}"
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            parameters = (*parameters, -1 if limit is None else limit, offset)
+        return map(self.__to_task, self.connection.execute(sql, parameters))
+
+    def __new_row(self, task_id, description, priority, deadline_str, completed):
+        self.__validate_priority(priority)
+        if not isinstance(task_id, int):
+            raise ValueError("Task ID must be an integer.")
+        deadline = parse_deadline(deadline_str)
+        return task_id, description, self.__rank[priority], self.__ordinal(deadline), bool(completed)
+
+    def add_listener(self, listener):
+        """
+        Registers a function that is called after every change to a task. See TaskManager.add_listener.
+        """
+        self.__listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self.__listeners.remove(listener)
+
+    def __notify(self, action, tasks):
+        for listener in self.__listeners:
+            for task in tasks:
+                listener(action, task)
+
+    def __read_for_listeners(self, task_ids):
+        # tasks are only read back when someone listens
+        if not self.__listeners:
+            return []
+        return [self.get_task(task_id) for task_id in task_ids]
+
+    def add_task(self, task_id, description, priority, deadline_str, completed=False):
+        """
+        Adds a new task.
+        Args:
+            task_id (int): ID of the task.
+            description (str): description of the task.
+            priority (str):  priority of the task (low, medium, high).
+            deadline_str (str): deadline for the task in DD-MM-YYYY format, or None for no deadline.
+            completed (bool): Whether the task is completed. Defaults to False.
+        Raises:
+            ValueError: If the priority is invalid, the date format is incorrect or task ID already exists.
+        """
+        self.__validate_priority(priority)
+        try:
+            row = self.__new_row(task_id, description, priority, deadline_str, completed)
+        except ValueError:
+            if isinstance(task_id, int) and self.__existing_ids([task_id]):
+                raise ValueError(f"Task with ID {task_id} already exists.")
+            raise
+        try:
+            with self.connection:
+                self.connection.execute(f"INSERT INTO tasks ({TASK_COLUMNS}) VALUES (?, ?, ?, ?, ?)", row)
+        except sqlite3.IntegrityError as e:
+            # only a primary key violation means the ID is taken
+            if "tasks.id" not in str(e):
+                raise
+            raise ValueError(f"Task with ID {task_id} already exists.")
+        self.__notify("add", self.__read_for_listeners((task_id,)))
+
+    def remove_task(self, task_id):
+        """
+        Removes a task.
+        Args:
+            task_id (int): ID of the task to remove.
+        Returns:
+            str: A message indicating if the task was found and removed.
+        """
+        removed_tasks = [task for task in self.__read_for_listeners((task_id,)) if not isinstance(task, str)]
+        with self.connection:
+            removed = self.connection.execute("DELETE FROM tasks WHERE id = ?", (task_id,)).rowcount
+        if not removed:
+            return "Task not found!"
+        self.__notify("remove", removed_tasks)
+
+    def __parse_changes(self, updated_task):
+        valid_keys = {"description", "priority", "deadline", "completed"}
+        for key in updated_task:
+            if key not in valid_keys:
+                raise ValueError(f"Invalid key: {key}. Valid keys are: {', '.join(valid_keys)}")
+
+        columns = {}
+        for key, value in updated_task.items():
+            if key == "description":
+                columns["description"] = value
+            elif key == "priority":
+                self.__validate_priority(value)
+                columns["priority"] = self.__rank[value]
+            elif key == "deadline":
+                columns["deadline"] = self.__ordinal(parse_deadline(value))
+            elif key == "completed":
+                columns["completed"] = bool(value)
+        return columns
+
+    def __update(self, task_id, columns):
+        if not columns:
+            return self.connection.execute("SELECT 1 FROM tasks WHERE id = ?", (task_id,)).fetchone() is not None
+        assignments = ", ".join(f"{column} = ?" for column in columns)
+        cursor = self.connection.execute(f"UPDATE tasks SET {assignments} WHERE id = ?", (*columns.values(), task_id))
+        return cursor.rowcount > 0
+
+    def update_task(self, task_id, updated_task):
+        """
+        Updates an existing task with new information.
+        Args:
+            task_id (int): ID of the task to update.
+            updated_task (dict): A dictionary of the fields to update {"description": "New desc"}.
+        Raises:
+            ValueError: If any of the keys are invalid or the date format is incorrect.
+        Returns:
+            str: A message if task was found and updated.
+        """
+        columns = self.__parse_changes(updated_task)
+        with self.connection:
+            updated = self.__update(task_id, columns)
+        if not updated:
+            return "Task not found!"
+        self.__notify("update", self.__read_for_listeners((task_id,)))
+
+    def __existing_ids(self, task_ids):
+        existing = set()
+        # stay below SQLite's limit on the number of parameters of one statement
+        for start in range(0, len(task_ids), 900):
+            chunk = task_ids[start:start + 900]
+            placeholders = ", ".join("?" * len(chunk))
+            existing.update(task_id for task_id, in self.connection.execute(
+                f"SELECT id FROM tasks WHERE id IN ({placeholders})", chunk))
+        return existing
+
+    def add_tasks(self, tasks):
+        """
+        Adds many tasks at once. Every row is validated, invalid rows are skipped and reported,
+        and the rows are written batch_size at a time in one transaction.
+        Args:
+            tasks (iterable): Rows of (task_id, description, priority, deadline[, completed]).
+        Returns:
+            list of tuple: (row index, error message) for every row that was not added.
+        """
+        errors = []
+        added_ids = []
+        # (row index, database row, error found after the duplicate check would have run)
+        batch = []
+
+        def write_batch():
+            existing = self.__existing_ids([row[0] for _, row, _ in batch if isinstance(row[0], int)])
+            rows = []
+            for row_index, row, error in batch:
+                if isinstance(row[0], int) and row[0] in existing:
+                    errors.append((row_index, f"Task with ID {row[0]} already exists."))
+                elif error is not None:
+                    errors.append((row_index, error))
+                else:
+                    existing.add(row[0])
+                    rows.append(row)
+            self.connection.executemany(f"INSERT INTO tasks ({TASK_COLUMNS}) VALUES (?, ?, ?, ?, ?)", rows)
+            added_ids.extend(row[0] for row in rows)
+            batch.clear()
+
+        with self.connection:
+            for row_index, row in enumerate(tasks):
+                try:
+                    if len(row) not in (4, 5):
+                        raise ValueError("Row must have 4 or 5 fields.")
+                    self.__validate_priority(row[2])
+                except (TypeError, ValueError) as e:
+                    errors.append((row_index, str(e)))
+                    continue
+                # like TaskManager, a duplicate ID is reported before a bad ID type or deadline
+                try:
+                    batch.append((row_index, self.__new_row(*row[:4], row[4] if len(row) == 5 else False), None))
+                except ValueError as e:
+                    batch.append((row_index, (row[0],), str(e)))
+                if len(batch) >= self.batch_size:
+                    write_batch()
+            write_batch()
+        errors.sort()
+        self.__notify("add", self.__read_for_listeners(added_ids))
+        return errors
+
+    def remove_tasks(self, task_ids):
+        """
+        Removes many tasks at once, in one transaction.
+        Args:
+            task_ids (iterable): IDs of the tasks to remove.
+        Returns:
+            list of tuple: (row index, error message) for every ID that was not found.
+        """
+        errors = []
+        removed_tasks = []
+        with self.connection:
+            for row_index, task_id in enumerate(task_ids):
+                removed_tasks.extend(self.__read_for_listeners((task_id,)))
+                if not self.connection.execute("DELETE FROM tasks WHERE id = ?", (task_id,)).rowcount:
+                    errors.append((row_index, "Task not found!"))
+        self.__notify("remove", [task for task in removed_tasks if not isinstance(task, str)])
+        return errors
+
+    def update_tasks(self, updates):
+        """
+        Updates many tasks at once, in one transaction. Invalid updates are skipped and reported.
+        Args:
+            updates (dict or iterable): {task_id: updated_task} or (task_id, updated_task) pairs.
+        Returns:
+            list of tuple: (row index, error message) for every update that was not applied.
+        """
+        if isinstance(updates, dict):
+            updates = updates.items()
+        errors = []
+        updated_ids = []
+        with self.connection:
+            for row_index, (task_id, updated_task) in enumerate(updates):
+                try:
+                    columns = self.__parse_changes(updated_task)
+                except ValueError as e:
+                    errors.append((row_index, str(e)))
+                    continue
+                if self.__update(task_id, columns):
+                    updated_ids.append(task_id)
+                else:
+                    errors.append((row_index, "Task not found!"))
+        self.__notify("update", self.__read_for_listeners(updated_ids))
+        return errors
+
+    @property
+    def tasks(self):
+        return list(self.__select(order="id"))
+
+    def get_task(self, task_id):
+        """
+        Get task by its ID.
+        Args:
+            task_id (int): The ID of the task we need.
+        Returns:
+            list or str: The task details as a list, or a message if the task is not found.
+        """
+        row = self.connection.execute(f"SELECT {TASK_COLUMNS} FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        if row is not None:
+            return self.__to_task(row)
+        return f"Task with id {task_id} not found!"
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def filter_tasks_by_deadline(self, date_str, filter_type='before'):
+        """
+        Filters tasks based on their deadlines.
+        Args:
+            date_str (str): target date in DD-MM-YYYY format.
+            filter_type (str): filter tasks 'before' or 'after' the target date. Default = 'before'.
+        Raises:
+            ValueError: If the date format is incorrect or the filter_type is invalid.
+        Returns:
+            list: A list of tasks that match the filter criteria.
+        """
+        if not self.connection.execute("SELECT EXISTS (SELECT 1 FROM tasks)").fetchone()[0]:
+            return []
+
+        if filter_type == 'before':
+            return self.tasks_before(date_str)
+        elif filter_type == 'after':
+            return self.tasks_after(date_str)
+        else:
+            raise ValueError("Invalid filter_type. Must be 'before' or 'after'.")
+
+    def __deadline_range(self, start, end, include_start=True, include_end=True):
+        conditions = []
+        parameters = []
+        if start is not None:
+            conditions.append("deadline >= ?" if include_start else "deadline > ?")
+            parameters.append(self.__day(start))
+        # only one upper bound, SQLite would otherwise scan up to the looser one
+        if end is not None:
+            conditions.append("deadline <= ?" if include_end else "deadline < ?")
+            parameters.append(self.__day(end))
+        else:
+            conditions.append("deadline < ?")
+            parameters.append(NO_DEADLINE)
+        return " AND ".join(conditions), parameters
+
+    def tasks_between(self, start, end, include_start=True, include_end=True):
+        """
+        Finds tasks with deadlines between two dates, with a range scan of the deadline index.
+        Args:
+            start (str or None): first date in DD-MM-YYYY format, None for no lower bound.
+            end (str or None): last date in DD-MM-YYYY format, None for no upper bound.
+            include_start (bool, optional): whether tasks due on start are included. Defaults to True.
+            include_end (bool, optional): whether tasks due on end are included. Defaults to True.
+        Raises:
+            ValueError: If a date format is incorrect.
+        Returns:
+            list: The matching tasks sorted by deadline. Tasks without a deadline are not included.
+        """
+        where, parameters = self.__deadline_range(start, end, include_start, include_end)
+        return list(self.__select(where, parameters))
+
+    def tasks_before(self, date_str, inclusive=False):
+        return self.tasks_between(None, date_str, include_end=inclusive)
+
+    def tasks_after(self, date_str, inclusive=False):
+        return self.tasks_between(date_str, None, include_start=inclusive)
+
+    def tasks_on(self, date_str):
+        return self.tasks_between(date_str, date_str)
+
+    def tasks_without_deadline(self):
+        """
+        Returns:
+            list: The tasks without a deadline sorted by task ID.
+        """
+        return list(self.__select("deadline = ?", (NO_DEADLINE,)))
+
+    def iter_tasks_by_deadline(self, ascending=True, offset=0, limit=None, formatted=False):
+        """
+        Lazily yields the tasks with a deadline in deadline order, straight from a database cursor.
+        Args:
+            ascending (bool, optional): earliest deadline first if True, else latest first.
+            offset (int, optional): number of tasks to skip. Defaults to 0.
+            limit (int, optional): maximum number of tasks to yield. Defaults to all.
+            formatted (bool, optional): yield rows formatted like sort_tasks_by_deadline instead of tasks.
+        Returns:
+            iterator: The tasks, or their formatted rows.
+        """
+        direction = "" if ascending else " DESC"
+        order = f"deadline{direction}, id{direction}"
+        if not formatted:
+            return self.__select("deadline < ?", (NO_DEADLINE,), order, limit, offset)
+        # the rows are formatted by SQLite, which is much faster than strftime in Python
+        cursor = self.connection.execute(
+            f"SELECT {DEADLINE_ROW} FROM tasks WHERE deadline < ? ORDER BY {order} LIMIT ? OFFSET ?",
+            (NO_DEADLINE, -1 if limit is None else limit, offset))
+        return (row for row, in cursor)
+
+    def iter_tasks_by_priority(self, ascending=True, offset=0, limit=None, formatted=False):
+        """
+        Lazily yields the tasks in priority order, straight from a database cursor.
+        Args:
+            ascending (bool, optional): lowest priority first if True, else highest first.
+            offset (int, optional): number of tasks to skip. Defaults to 0.
+            limit (int, optional): maximum number of tasks to yield. Defaults to all.
+            formatted (bool, optional): yield rows formatted like sort_tasks_by_priority instead of tasks.
+        Returns:
+            iterator: The tasks, or their formatted rows.
+        """
+        direction = "" if ascending else " DESC"
+        order = f"priority{direction}, id{direction}"
+        if not formatted:
+            return self.__select(order=order, limit=limit, offset=offset)
+        row = PRIORITY_ROW.format(priority_name=self.__priority_name)
+        cursor = self.connection.execute(f"SELECT {row} FROM tasks ORDER BY {order} LIMIT ? OFFSET ?",
+                                         (-1 if limit is None else limit, offset))
+        return (row for row, in cursor)
+
+    def __page(self, column, where, parameters, limit, cursor, ascending):
+        # keyset pagination: the next page starts after the (column, id) of the last task seen
+        if cursor is not None:
+            where += f" AND ({column}, id) {'>' if ascending else '<'} (?, ?)"
+            parameters = (*parameters, *cursor)
+        direction = "" if ascending else " DESC"
+        page = list(self.__select(where, parameters, f"{column}{direction}, id{direction}", limit + 1))
+        if len(page) <= limit:
+            return page, None
+        page = page[:limit]
+        last = page[-1]
+        value = self.__ordinal(last[3]) if column == "deadline" else self.__rank[last[2]]
+        return page, (value, last[0])
+
+    def page_tasks_by_deadline(self, limit=50, cursor=None, ascending=True):
+        """
+        Returns one page of tasks with a deadline, in deadline order. Pages are keyed on the
+        deadline and ID of the last task seen, so they stay stable while tasks are added or removed.
+        Args:
+            limit (int, optional): page size. Defaults to 50.
+            cursor (tuple, optional): the cursor returned with the previous page, None for the first page.
+            ascending (bool, optional): earliest deadline first if True, else latest first.
+        Returns:
+            tuple: (list of tasks, cursor of the next page or None if this is the last page).
+        """
+        return self.__page("deadline", "deadline < ?", (NO_DEADLINE,), limit, cursor, ascending)
+
+    def page_tasks_by_priority(self, limit=50, cursor=None, ascending=True):
+        """
+        Returns one page of tasks in priority order. See page_tasks_by_deadline.
+        Returns:
+            tuple: (list of tasks, cursor of the next page or None if this is the last page).
+        """
+        return self.__page("priority", "1", (), limit, cursor, ascending)
+
+    def sort_tasks_by_deadline(self, ascending=True):
+        """
+        Sorts tasks by their deadlines.
+        Args:
+            ascending (bool, optional): Sort in ascending order if True, else descending.
+        Returns:
+            str: A formatted string of the sorted tasks with deadlines.
+        """
+        rows = list(self.iter_tasks_by_deadline(ascending, formatted=True))
+        if not rows:
+            return "No tasks to sort."
+        return "Sorted tasks with valid deadlines:\n" + "\n".join(rows)
+
+    def sort_tasks_by_priority(self, ascending=True):
+        """
+        Sorts the tasks by priority. The priority is sorted in order: "low", "medium", "high".
+        Args:
+            ascending (bool, optional): True, sorts in ascending, False, sorts in descending.
+        Returns:
+            list of str: A list of strings, each string is a task
+        """
+        return list(self.iter_tasks_by_priority(ascending, formatted=True))
+
+    def find_task_by_deadline(self, date_str):
+        """
+        Finds the tasks due on a date.
+        Args:
+            date_str (str): deadline date in the format "DD-MM-YYYY".
+        Returns:
+            list of list: A list of tasks sorted by task ID.
+        """
+        return self.tasks_on(date_str)
+
+    def find_task_by_priority(self, priority):
+        """
+        Finds the tasks with a priority, with a scan of the priority index.
+        Args:
+            priority (str): The priority level to search "low", "medium", or "high".
+        Returns:
+            list of list: A list of tasks sorted by deadline, tasks without a deadline last.
+        Raises:
+            ValueError: If the provided priority is not valid.
+        """
+        self.__validate_priority(priority)
+        return list(self.__select("priority = ?", (self.__rank[priority],)))
+
+    def most_urgent_tasks(self, priority, k, pending_only=True):
+        """
+        Finds the k tasks of a priority with the earliest deadlines.
+        Args:
+            priority (str): The priority level to search "low", "medium", or "high".
+            k (int): maximum number of tasks to return.
+            pending_only (bool, optional): skip completed tasks. Defaults to True.
+        Returns:
+            list of list: Up to k tasks sorted by deadline.
+        Raises:
+            ValueError: If the provided priority is not valid.
+        """
+        self.__validate_priority(priority)
+        where = "priority = ? AND completed = 0" if pending_only else "priority = ?"
+        return list(self.__select(where, (self.__rank[priority],), limit=k))
+
+    def summary(self, today=None):
+        """
+        Counts the tasks with aggregate queries.
+        Args:
+            today (datetime, optional): the current date. Defaults to datetime.now().
+        Returns:
+            dict: The same counts as TaskCounters.summary.
+        """
+        day = (today or datetime.now()).toordinal()
+        total, completed = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(completed), 0) FROM tasks").fetchone()
+        overdue, = self.connection.execute(
+            "SELECT COUNT(*) FROM tasks WHERE completed = 0 AND deadline < ?", (day,)).fetchone()
+        by_priority = dict.fromkeys(self.PRIORITIES, 0)
+        for rank, count in self.connection.execute("SELECT priority, COUNT(*) FROM tasks GROUP BY priority"):
+            by_priority[self.PRIORITIES[rank]] = count
+        return {
+            "total": total,
+            "completed": completed,
+            "pending": total - completed,
+            "overdue": overdue,
+            "by_priority": by_priority,
+        }
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
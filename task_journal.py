@@ -0,0 +1,209 @@
+import json
+import os
+import shutil
+import threading
+
+from task_manager import BinaryTaskFileManager, parse_date
+
+
+class TaskJournal:
+    """
+    Makes every change to a TaskManager durable by appending one line per change to a
+    write-ahead log instead of rewriting the whole task file. The log is synced to disk in
+    groups, by the change that fills a group or by a timer once sync_interval has passed, and
+    compaction folds it into a binary snapshot in a background thread.
+    Files used, for filename='tasks':
+        tasks.snapshot: the last snapshot, written by BinaryTaskFileManager.
+        tasks.log: changes made after the snapshot.
+        tasks.log.old: changes being folded into a new snapshot by a running compaction, or by
+            one that failed. It is kept until a snapshot covering it is written.
+    Attributes:
+        manager (TaskManager): the journaled task manager.
+        sync_every (int): number of log records written before the log is synced to disk.
+        sync_interval (float): maximum number of seconds between a write and the sync covering it,
+            None to sync only every sync_every records.
+        compact_after (int): number of log records that starts a background compaction, None to disable.
+    """
+
+    def __init__(self, manager, filename='tasks', sync_every=100, sync_interval=1.0, compact_after=100000):
+        self.manager = manager
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.compact_after = compact_after
+        self.snapshot_filename = filename + ".snapshot"
+        self.log_filename = filename + ".log"
+        self.old_log_filename = filename + ".log.old"
+        self.__log = None
+        self.__unsynced = 0
+        self.__sync_timer = None
+        # guards the log against the sync timer, which runs in its own thread
+        self.__lock = threading.RLock()
+        self.__records_since_compaction = 0
+        self.__compaction = None
+        self.__compaction_error = None
+
+    def recover(self):
+        """
+        Loads the last snapshot, replays the logs over it into the manager and starts
+        journaling the manager's changes. The manager should be empty.
+        Returns:
+            list of tuple: (row index, error message) for every recovered task the manager rejected.
+        """
+        rows = {}
+        try:
+            with BinaryTaskFileManager(self.snapshot_filename).open_tasks() as snapshot:
+                for task in snapshot:
+                    rows[task[0]] = task
+        except FileNotFoundError:
+            pass
+        # a crash during compaction can leave the old log behind, it is replayed before the current one
+        for log_filename in (self.old_log_filename, self.log_filename):
+            self.__replay(log_filename, rows)
+
+        errors = self.manager.add_tasks(rows.values())
+        if os.path.exists(self.old_log_filename):
+            # finish the interrupted compaction before the old log can be overwritten by a new one
+            self.__write_snapshot(list(rows.values()))
+        self.__log = open(self.log_filename, "a", encoding="utf-8")
+        self.manager.add_listener(self.__on_change)
+        return errors
+
+    @staticmethod
+    def __replay(log_filename, rows):
+        """
+        Applies the records of a log to rows. Records hold the full task, so replaying a log
+        over a snapshot that already contains some of its changes gives the same result.
+        """
+        try:
+            with open(log_filename, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return
+
+        for line_number, line in enumerate(lines):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                if line_number == len(lines) - 1:
+                    # the last record was cut short by a crash and was never acknowledged
+                    break
+                raise ValueError(f"Corrupted record on line {line_number + 1} of '{log_filename}'.")
+            if record[0] == "put":
+                _, task_id, description, priority, deadline_str, completed = record
+                deadline = parse_date(deadline_str) if deadline_str else None
+                rows[task_id] = [task_id, description, priority, deadline, completed]
+            elif record[0] == "remove":
+                rows.pop(record[1], None)
+
+    def __on_change(self, action, task):
+        if action == "remove":
+            record = ["remove", task[0]]
+        else:
+            deadline_str = task[3].strftime('%d-%m-%Y') if task[3] else None
+            record = ["put", task[0], task[1], task[2], deadline_str, task[4]]
+        with self.__lock:
+            self.__log.write(json.dumps(record, separators=(",", ":")) + "\n")
+            self.__unsynced += 1
+            self.__records_since_compaction += 1
+            if self.__unsynced >= self.sync_every:
+                self.sync()
+            elif self.__sync_timer is None and self.sync_interval is not None:
+                # the first unsynced record starts the timer, so it is on disk within sync_interval
+                self.__sync_timer = threading.Timer(self.sync_interval, self.__sync_due)
+                self.__sync_timer.daemon = True
+                self.__sync_timer.start()
+            if self.compact_after is not None and self.__records_since_compaction >= self.compact_after:
+                self.compact()
+
+    def __sync_due(self):
+        with self.__lock:
+            self.__sync_timer = None
+            if self.__unsynced:
+                self.sync()
+
+    def sync(self):
+        """
+        Flushes the log and waits until it is on disk. Every change made before the call
+        survives a crash once it returns.
+        """
+        with self.__lock:
+            if self.__sync_timer is not None:
+                self.__sync_timer.cancel()
+                self.__sync_timer = None
+            if self.__log is None:
+                return
+            self.__log.flush()
+            os.fsync(self.__log.fileno())
+            self.__unsynced = 0
+
+    def compact(self, wait=False):
+        """
+        Folds the log into a new snapshot. The log is swapped for an empty one right away and
+        the snapshot is written by a background thread, so new changes are not blocked.
+        Args:
+            wait (bool, optional): wait until the new snapshot is written. Defaults to False.
+        Raises:
+            Exception: The error of the previous compaction, or of this one when waiting for it.
+                The logs it would have folded are kept and replayed by recover.
+        """
+        self.__join_compaction()
+        with self.__lock:
+            self.sync()
+            self.__log.close()
+            if os.path.exists(self.old_log_filename):
+                # the last snapshot failed and still needs the old log, so this log is added to it
+                with open(self.log_filename, "rb") as log, open(self.old_log_filename, "ab") as old_log:
+                    shutil.copyfileobj(log, old_log)
+                    old_log.flush()
+                    os.fsync(old_log.fileno())
+                os.remove(self.log_filename)
+            else:
+                os.replace(self.log_filename, self.old_log_filename)
+            self.__log = open(self.log_filename, "a", encoding="utf-8")
+            self.__records_since_compaction = 0
+
+        rows = [list(task) for task in self.manager.tasks]
+        self.__compaction = threading.Thread(target=self.__compact_in_background, args=(rows,), daemon=True)
+        self.__compaction.start()
+        if wait:
+            self.__join_compaction()
+
+    def __compact_in_background(self, rows):
+        try:
+            self.__write_snapshot(rows)
+        except Exception as e:
+            # kept for the next compact or close, which raise it
+            self.__compaction_error = e
+
+    def __join_compaction(self):
+        if self.__compaction is not None:
+            self.__compaction.join()
+            self.__compaction = None
+        error, self.__compaction_error = self.__compaction_error, None
+        if error is not None:
+            raise error
+
+    def __write_snapshot(self, rows):
+        BinaryTaskFileManager(self.snapshot_filename).save_tasks_to_file(rows)
+        os.remove(self.old_log_filename)
+
+    def close(self):
+        """
+        Stops journaling, syncs the log and waits for a running compaction.
+        Raises:
+            Exception: The error of a failed compaction. Its logs are kept and replayed by recover.
+        """
+        if self.__log is None:
+            return
+        self.manager.remove_listener(self.__on_change)
+        with self.__lock:
+            self.sync()
+            self.__log.close()
+            self.__log = None
+        self.__join_compaction()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
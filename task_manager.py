@@ -1,9 +1,90 @@
+import bisect
+import functools
+import io
+import itertools
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 
+@functools.lru_cache(maxsize=65536)
+def parse_date(date_str):
+    """
+    Parses a date in DD-MM-YYYY format. Well-formed dates are converted by slicing instead of
+    strptime, and results are cached, so tasks due on the same day share one datetime.
+    Args:
+        date_str (str): date in DD-MM-YYYY format.
+    Raises:
+        ValueError: If the date is not a valid DD-MM-YYYY date.
+    Returns:
+        datetime: The parsed date.
+    """
+    if len(date_str) == 10 and date_str[2] == "-" and date_str[5] == "-":
+        day, month, year = date_str[:2], date_str[3:5], date_str[6:]
+        if (day + month + year).isascii() and (day + month + year).isdigit():
+            return datetime(int(year), int(month), int(day))
+    # anything unusual, like single digit days, keeps the exact strptime behaviour
+    return datetime.strptime(date_str, "%d-%m-%Y")
+
+
+@functools.lru_cache(maxsize=65536)
+def format_date(date):
+    """
+    Formats a date as DD-MM-YYYY. Results are cached, since many tasks share a deadline.
+    Args:
+        date (datetime): the date to format.
+    Returns:
+        str: The formatted date.
+    """
+    return date.strftime('%d-%m-%Y')
+
+
+def parse_deadline(deadline):
+    """
+    Converts a deadline to a datetime.
+    Args:
+        deadline (str, datetime or None): deadline in DD-MM-YYYY format, an already parsed date or None.
+    Raises:
+        ValueError: If the date format is incorrect.
+    Returns:
+        datetime or None: The parsed deadline.
+    """
+    if deadline is None or isinstance(deadline, datetime):
+        return deadline
+    try:
+        return parse_date(deadline)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid date format. Please use DD-MM-YYYY.")
+
+
+def sort_by_key(arr, condition, ascending=True):
+    """
+    Stable sort of an array based on a given condition (decorate-sort-undecorate).
+    The condition is called exactly once per element and the sort never recurses,
+    so large, already sorted or all-equal inputs are handled in O(n log n).
+    Args:
+        arr (iterable): The elements to sort.
+        condition (function): A function that extracts the value to sort by.
+        ascending (bool, optional): ascending order if True, else descending.
+            Equal elements keep their original order in both directions.
+    Returns:
+        list: The sorted list.
+    """
+    arr = list(arr)
+    keys = [condition(x) for x in arr]
+    order = sorted(range(len(arr)), key=keys.__getitem__, reverse=not ascending)
+    return [arr[i] for i in order]
+
+
 def quicksort(arr, condition, ascending=True):
     """
-    Sorts an array using the quicksort algorithm based on a given condition.
+    Sorts an array based on a given condition. Kept for existing callers, the work
+    is done by sort_by_key.
      Args:
         arr (list): The list of elements to sort.
         condition (function): A function that extracts the value to sort by.
@@ -11,17 +92,7 @@ def quicksort(arr, condition, ascending=True):
     Returns:
         list: The sorted list.
     """
-    if len(arr) <= 1:
-        return arr
-    pivot = arr[len(arr) // 2]
-    middle = [x for x in arr if condition(x) == condition(pivot)]
-    if ascending:
-        left = [x for x in arr if (condition(x) < condition(pivot))]
-        right = [x for x in arr if (condition(x) > condition(pivot))]
-    else:
-        left = [x for x in arr if (condition(x) > condition(pivot))]
-        right = [x for x in arr if (condition(x) < condition(pivot))]
-    return quicksort(left, condition, ascending) + middle + quicksort(right, condition, ascending)
+    return sort_by_key(arr, condition, ascending)
 
 
 def binary_search(arr, condition, target, ascending=True):
@@ -48,21 +119,396 @@ def binary_search(arr, condition, target, ascending=True):
     return -1
 
 
+def lower_bound(arr, condition, target):
+    """
+    Binary search for the first element whose value is not less than the target.
+    Args:
+        arr (list): The list of elements, sorted in ascending order.
+        condition (function): A function that extracts the value to search by.
+        target (any): The value to search for.
+    Returns:
+        int: The index of the first element >= target, or len(arr) if there is none.
+    """
+    left, right = 0, len(arr)
+    while left < right:
+        mid = (left + right) // 2
+        if condition(arr[mid]) < target:
+            left = mid + 1
+        else:
+            right = mid
+    return left
+
+
+def upper_bound(arr, condition, target):
+    """
+    Binary search for the first element whose value is greater than the target.
+    Args:
+        arr (list): The list of elements, sorted in ascending order.
+        condition (function): A function that extracts the value to search by.
+        target (any): The value to search for.
+    Returns:
+        int: The index of the first element > target, or len(arr) if there is none.
+    """
+    left, right = 0, len(arr)
+    while left < right:
+        mid = (left + right) // 2
+        if target < condition(arr[mid]):
+            right = mid
+        else:
+            left = mid + 1
+    return left
+
+
+def deadline_bounds(arr, start, end, include_start=True, include_end=True):
+    """
+    Finds the positions of the tasks due between two dates in a list of tasks sorted by
+    deadline, with tasks without a deadline at the end. Those tasks are never in the range.
+    Args:
+        arr (list): The tasks, sorted by deadline.
+        start (datetime or None): lower bound, None for no lower bound.
+        end (datetime or None): upper bound, None for no upper bound.
+        include_start (bool, optional): whether tasks due on start are included.
+        include_end (bool, optional): whether tasks due on end are included.
+    Returns:
+        tuple: (first, last) positions of the range, last is exclusive.
+    """
+    def condition(task):
+        return task[3] if task[3] else datetime.max
+
+    if start is None:
+        first = 0
+    elif include_start:
+        first = lower_bound(arr, condition, start)
+    else:
+        first = upper_bound(arr, condition, start)
+
+    if end is None:
+        last = lower_bound(arr, condition, datetime.max)
+    elif include_end:
+        last = upper_bound(arr, condition, end)
+    else:
+        last = lower_bound(arr, condition, end)
+    return first, max(first, last)
+
+
+class SortedIndex:
+    """
+    Keeps tasks ordered by a sort key. Tasks are inserted and removed with bisect,
+    so the order never has to be rebuilt from scratch after a single change.
+    Attributes:
+        key (function): A function that extracts the sort key of a task. Keys must be unique.
+    """
+
+    def __init__(self, key, tasks=()):
+        self.key = key
+        self.__keys = []
+        self.__tasks = []
+        self.rebuild(tasks)
+
+    def rebuild(self, tasks, presorted=False, keys=None):
+        """
+        Replaces the content of the index with the given tasks.
+        Args:
+            tasks (iterable): The tasks to index.
+            presorted (bool, optional): Whether the tasks are already in key order, so sorting is skipped.
+            keys (list, optional): The keys of the tasks, in the same order, if they are already known.
+        """
+        tasks = list(tasks)
+        if keys is None:
+            keys = [self.key(task) for task in tasks]
+        if presorted:
+            self.__keys = keys
+            self.__tasks = tasks
+            return
+        order = sorted(range(len(tasks)), key=keys.__getitem__)
+        self.__keys = [keys[i] for i in order]
+        self.__tasks = [tasks[i] for i in order]
+
+    def insert(self, task):
+        """
+        Inserts a task at its sorted position.
+        Args:
+            task (list): The task to insert.
+        Returns:
+            int: The position of the task.
+        """
+        key = self.key(task)
+        index = bisect.bisect_right(self.__keys, key)
+        self.__keys.insert(index, key)
+        self.__tasks.insert(index, task)
+        return index
+
+    def remove(self, task, key=None):
+        """
+        Removes a task. Must be called before any field used by the key is changed,
+        unless the key the task was inserted with is given.
+        Args:
+            task (list): The task to remove.
+            key (optional): The key of the task when it was inserted. Defaults to its current key.
+        Raises:
+            ValueError: If the task is not in the index.
+        Returns:
+            int: The position the task had.
+        """
+        if key is None:
+            key = self.key(task)
+        index = bisect.bisect_left(self.__keys, key)
+        while index < len(self.__keys) and self.__keys[index] == key:
+            if self.__tasks[index] is task:
+                del self.__keys[index]
+                del self.__tasks[index]
+                return index
+            index += 1
+        raise ValueError(f"Task {task[0]} is not in the index.")
+
+    def bisect_left(self, key):
+        """
+        Returns:
+            int: The position of the first task whose key is >= key.
+        """
+        return bisect.bisect_left(self.__keys, key)
+
+    def bisect_right(self, key):
+        """
+        Returns:
+            int: The position of the first task whose key is > key.
+        """
+        return bisect.bisect_right(self.__keys, key)
+
+    def iter_range(self, first=0, last=None, ascending=True):
+        """
+        Yields the tasks between two positions without copying the index.
+        Args:
+            first (int, optional): position of the first task. Defaults to 0.
+            last (int, optional): position after the last task. Defaults to the end of the index.
+            ascending (bool, optional): yields from first to last if True, else from last to first.
+        Yields:
+            list: The tasks in index order.
+        """
+        if last is None:
+            last = len(self.__tasks)
+        positions = range(first, last) if ascending else range(last - 1, first - 1, -1)
+        for position in positions:
+            yield self.__tasks[position]
+
+    def __len__(self):
+        return len(self.__tasks)
+
+    def __iter__(self):
+        return iter(self.__tasks)
+
+    def __reversed__(self):
+        return reversed(self.__tasks)
+
+    def __getitem__(self, index):
+        return self.__tasks[index]
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return f"SortedIndex({self.__tasks!r})"
+
+
+_shared_ordinals = {}
+
+
+class CompactTask:
+    """
+    A task record that needs less memory than a five element list. The deadline is kept as
+    a day ordinal shared between tasks due on the same day and the priority string is interned.
+    The record supports the same positional access as list-based tasks:
+    [task_id, description, priority, deadline, completed].
+    Attributes:
+        task_id (int): ID of the task.
+        description (str): description of the task.
+        priority (str): priority of the task.
+        deadline_ordinal (int or None): the deadline as returned by datetime.toordinal().
+        completed (bool): Whether the task is completed.
+    """
+    __slots__ = ("task_id", "description", "priority", "deadline_ordinal", "completed")
+    FIELDS = ("task_id", "description", "priority", "deadline", "completed")
+
+    def __init__(self, task_id, description, priority, deadline, completed=False):
+        self.task_id = task_id
+        self.description = description
+        self.priority = sys.intern(priority) if isinstance(priority, str) else priority
+        self.deadline = deadline
+        self.completed = bool(completed)
+
+    @property
+    def deadline(self):
+        if self.deadline_ordinal is None:
+            return None
+        return datetime.fromordinal(self.deadline_ordinal)
+
+    @deadline.setter
+    def deadline(self, deadline):
+        if deadline:
+            ordinal = deadline.toordinal()
+            self.deadline_ordinal = _shared_ordinals.setdefault(ordinal, ordinal)
+        else:
+            self.deadline_ordinal = None
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [getattr(self, field) for field in self.FIELDS[index]]
+        return getattr(self, self.FIELDS[index])
+
+    def __setitem__(self, index, value):
+        field = self.FIELDS[index]
+        if field == "priority" and isinstance(value, str):
+            value = sys.intern(value)
+        setattr(self, field, value)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def __iter__(self):
+        return (getattr(self, field) for field in self.FIELDS)
+
+    def __eq__(self, other):
+        if isinstance(other, (list, CompactTask)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"CompactTask{tuple(self)!r}"
+
+
+class TextIndex:
+    """
+    Inverted index from the words of task descriptions to task IDs. Words are case-folded,
+    and a sorted vocabulary allows prefix matching with bisect.
+    """
+    WORD_PATTERN = re.compile(r"\w+")
+
+    def __init__(self):
+        self.__postings = {}
+        self.__vocabulary = []
+
+    @classmethod
+    def tokenize(cls, text):
+        """
+        Args:
+            text (str): The text to split into words.
+        Returns:
+            list of str: The case-folded words, in order. Empty if text is not a string, such as a missing description.
+        """
+        if not isinstance(text, str):
+            return []
+        return cls.WORD_PATTERN.findall(text.casefold())
+
+    def add(self, task_id, text):
+        for word in set(self.tokenize(text)):
+            task_ids = self.__postings.get(word)
+            if task_ids is None:
+                task_ids = self.__postings[word] = set()
+                bisect.insort(self.__vocabulary, word)
+            task_ids.add(task_id)
+
+    def remove(self, task_id, text):
+        for word in set(self.tokenize(text)):
+            task_ids = self.__postings[word]
+            task_ids.discard(task_id)
+            if not task_ids:
+                del self.__postings[word]
+                del self.__vocabulary[bisect.bisect_left(self.__vocabulary, word)]
+
+    def lookup(self, word, prefix=False):
+        """
+        Args:
+            word (str): a case-folded word.
+            prefix (bool, optional): match every word that starts with word. Defaults to False.
+        Returns:
+            set: IDs of the tasks whose description contains a matching word.
+        """
+        if not prefix:
+            return set(self.__postings.get(word, ()))
+        task_ids = set()
+        position = bisect.bisect_left(self.__vocabulary, word)
+        while position < len(self.__vocabulary) and self.__vocabulary[position].startswith(word):
+            task_ids |= self.__postings[self.__vocabulary[position]]
+            position += 1
+        return task_ids
+
+    def search(self, query, mode="and", prefix=False):
+        """
+        Args:
+            query (str): the words to search for.
+            mode (str, optional): 'and' to match all words, 'or' to match any word. Defaults to 'and'.
+            prefix (bool, optional): match words that start with the query words. Defaults to False.
+        Returns:
+            set: IDs of the matching tasks.
+        """
+        # rarest words first, so AND queries shrink the candidate set as early as possible
+        postings = sorted((self.lookup(word, prefix) for word in set(self.tokenize(query))), key=len)
+        if not postings:
+            return set()
+        if mode == "and":
+            return set.intersection(*postings)
+        return set.union(*postings)
+
+
+def _text_matcher(query, mode="and", prefix=False):
+    """
+    Builds a predicate that matches tasks by the words of their description, the same way
+    TextIndex.search does, for searches that scan the tasks instead of using the index.
+    Args:
+        query (str): the words to search for.
+        mode (str, optional): 'and' to match all words, 'or' to match any word. Defaults to 'and'.
+        prefix (bool, optional): match words that start with the query words. Defaults to False.
+    Returns:
+        function: Returns True for a matching task.
+    """
+    words = set(TextIndex.tokenize(query))
+    combine = all if mode == "and" else any
+
+    def matches(task):
+        task_words = TextIndex.tokenize(task[1])
+        if prefix:
+            return bool(words) and combine(any(w.startswith(word) for w in task_words) for word in words)
+        return bool(words) and combine(word in task_words for word in words)
+    return matches
+
+
 class TaskManager:
     """
     Manages a list of tasks with functions to add, remove, update, filter, and sort tasks.
     Attributes:
         PRIORITIES (list): A list of valid priorities for tasks.
-        tasks (list): The list of tasks.
-        tasks_by_deadline (list): The list of tasks sorted by deadline.
-        tasks_by_priority (list): The list of tasks sorted by priority.
+        compact (bool): Whether tasks are stored as CompactTask records instead of lists.
+            Compact managers also use packed integer index keys, so task IDs must be integers
+            between 0 and COMPACT_MAX_TASK_ID.
+        statistics (TaskCounters): Task counts, updated on every change.
+        text_index (TextIndex or None): Words of the task descriptions, if the manager was
+            created with text_index=True.
+        tasks (list): The list of tasks, in insertion order.
+        tasks_by_deadline (SortedIndex): The tasks sorted by (deadline, task_id).
+        tasks_by_priority (SortedIndex): The tasks sorted by (priority, task_id).
+        priority_buckets (dict): One SortedIndex per priority with its tasks sorted by (deadline, task_id).
+        views (dict): The TaskView registered with add_view, by name.
     """
     PRIORITIES = ["low", "medium", "high"]
+    COMPACT_MAX_TASK_ID = 2 ** 40 - 1
 
-    def __init__(self):
-        self.tasks = []
-        self.tasks_by_deadline = []
-        self.tasks_by_priority = []
+    def __init__(self, compact=False, text_index=False):
+        self.compact = compact
+        self.__tasks_by_id = {}
+        self.__priority_order = {priority: i for i, priority in enumerate(self.PRIORITIES)}
+        if compact:
+            deadline_key, priority_key = self.__compact_deadline_key, self.__compact_priority_key
+        else:
+            deadline_key, priority_key = self.__deadline_key, self.__priority_key
+        self.tasks_by_deadline = SortedIndex(key=deadline_key)
+        self.tasks_by_priority = SortedIndex(key=priority_key)
+        self.priority_buckets = {priority: SortedIndex(key=deadline_key) for priority in self.PRIORITIES}
+        self.__listeners = []
+        self.statistics = TaskCounters(self.PRIORITIES)
+        self.text_index = TextIndex() if text_index else None
+        self.views = {}
 
     def __validate_priority(self, priority):
         """
@@ -75,10 +521,176 @@ class TaskManager:
         if priority not in self.PRIORITIES:
             raise ValueError(f"Invalid priority. Must be one of {', '.join(self.PRIORITIES)}.")
 
-    def __update_sorted_lists(self):
-        self.tasks_by_deadline = quicksort(self.tasks, condition=lambda t: t[3] if t[3] else datetime.max)
-        priority_order = {priority: i for i, priority in enumerate(self.PRIORITIES)}
-        self.tasks_by_priority = quicksort(self.tasks, condition=lambda t: priority_order[t[2]])
+    def __validate_id_order(self, task_id):
+        """
+        Checks that a new task ID can be compared with the existing ones, since the sorted indexes
+        order tasks with equal values by ID. The IDs already in the manager are comparable with each
+        other, so one of them is enough to check against.
+        Args:
+            task_id: the new task ID.
+        Raises:
+            ValueError: If the task ID cannot be ordered with the existing task IDs.
+        """
+        for existing_id in self.__tasks_by_id:
+            try:
+                task_id < existing_id
+            except TypeError:
+                raise ValueError(f"Task ID {task_id!r} cannot be ordered with the existing task IDs.")
+            return
+
+    def __parse_changes(self, updated_task):
+        """
+        Validates an update and converts it to new field values.
+        Args:
+            updated_task (dict): A dictionary of the fields to update {"description": "New desc"}.
+        Raises:
+            ValueError: If any of the keys are invalid, the priority is invalid or the date format is incorrect.
+        Returns:
+            dict: The new values keyed by their position in the task list.
+        """
+        valid_keys = {"description", "priority", "deadline", "completed"}
+        for key in updated_task:
+            if key not in valid_keys:
+                raise ValueError(f"Invalid key: {key}. Valid keys are: {', '.join(valid_keys)}")
+
+        new_values = {}
+        for key, value in updated_task.items():
+            if key == "description":
+                new_values[1] = value
+            elif key == "priority":
+                self.__validate_priority(value)
+                new_values[2] = value
+            elif key == "deadline":
+                new_values[3] = parse_deadline(value)
+            elif key == "completed":
+                new_values[4] = value
+        return new_values
+
+    @property
+    def tasks(self):
+        return list(self.__tasks_by_id.values())
+
+    @staticmethod
+    def __deadline_value(task):
+        return task[3] if task[3] else datetime.max
+
+    @staticmethod
+    def __deadline_key(task):
+        return (task[3] if task[3] else datetime.max, task[0])
+
+    # compact keys pack (value, task_id) into one int, which is much smaller than a tuple
+    @staticmethod
+    def __compact_deadline_key(task):
+        ordinal = task.deadline_ordinal
+        if ordinal is None:
+            ordinal = datetime.max.toordinal() + 1
+        return (ordinal << 40) | task.task_id
+
+    def __compact_priority_key(self, task):
+        return (self.__priority_order[task.priority] << 40) | task.task_id
+
+    def __new_task(self, task_id, description, priority, deadline, completed):
+        if self.compact:
+            if not isinstance(task_id, int) or not 0 <= task_id <= self.COMPACT_MAX_TASK_ID:
+                raise ValueError(f"Task ID must be an integer between 0 and {self.COMPACT_MAX_TASK_ID} in compact mode.")
+            return CompactTask(task_id, description, priority, deadline, completed)
+        return [task_id, description, priority, deadline, completed]
+
+    def __priority_key(self, task):
+        return (self.__priority_order[task[2]], task[0])
+
+    def __index_task(self, task):
+        self.tasks_by_deadline.insert(task)
+        self.tasks_by_priority.insert(task)
+        self.priority_buckets[task[2]].insert(task)
+
+    def __unindex_task(self, task):
+        self.tasks_by_deadline.remove(task)
+        self.tasks_by_priority.remove(task)
+        self.priority_buckets[task[2]].remove(task)
+
+    # __track/__untrack keep the per-task counters in sync; unlike the sorted
+    # indexes they are always updated one task at a time, also by the batch methods
+    def __track(self, task):
+        self.statistics.add(task)
+        if self.text_index is not None:
+            self.text_index.add(task[0], task[1])
+
+    def __untrack(self, task):
+        self.statistics.remove(task)
+        if self.text_index is not None:
+            self.text_index.remove(task[0], task[1])
+
+    def __rebuild_indexes(self):
+        tasks = self.__tasks_by_id.values()
+        self.tasks_by_deadline.rebuild(tasks)
+        self.tasks_by_priority.rebuild(tasks)
+        tasks_by_bucket = {priority: [] for priority in self.PRIORITIES}
+        for task in tasks:
+            tasks_by_bucket[task[2]].append(task)
+        for priority, bucket_tasks in tasks_by_bucket.items():
+            self.priority_buckets[priority].rebuild(bucket_tasks)
+
+    def __is_bulk(self, count):
+        # past this size one sort of everything is cheaper than inserting tasks one by one
+        return count > len(self.__tasks_by_id) // 16
+
+    def add_listener(self, listener):
+        """
+        Registers a function that is called after every change to a task, including
+        the tasks changed by the batch methods.
+        Args:
+            listener (function): Called as listener(action, task), where action is "add",
+                "remove" or "update" and task is the task after the change.
+        """
+        self.__listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """
+        Unregisters a function added with add_listener.
+        Args:
+            listener (function): The function to remove.
+        """
+        self.__listeners.remove(listener)
+
+    def add_view(self, name, predicate=None, key=None):
+        """
+        Registers a standing query that is kept up to date as tasks change, for example
+        manager.add_view("urgent", lambda task: task[2] == "high" and not task[4], lambda task: task[3] or datetime.max)
+        Args:
+            name (str): name of the view.
+            predicate (function, optional): Called as predicate(task), whether the task belongs to the view.
+                Defaults to every task.
+            key (function, optional): Called as key(task), the sort key of the view. Defaults to the task ID.
+        Raises:
+            ValueError: If a view with that name already exists.
+        Returns:
+            TaskView: The view, filled with the matching tasks.
+        """
+        if name in self.views:
+            raise ValueError(f"View {name} already exists.")
+        view = TaskView(name, predicate, key, self.__tasks_by_id.values())
+        self.views[name] = view
+        self.add_listener(view.on_change)
+        return view
+
+    def remove_view(self, name):
+        """
+        Unregisters a view, which then stops following the manager's changes.
+        Args:
+            name (str): name of the view.
+        Returns:
+            str: A message if the view was not found.
+        """
+        view = self.views.pop(name, None)
+        if view is None:
+            return "View not found!"
+        self.remove_listener(view.on_change)
+
+    def __notify(self, action, tasks):
+        for listener in self.__listeners:
+            for task in tasks:
+                listener(action, task)
 
     def add_task(self, task_id, description, priority, deadline_str, completed=False):
         """
@@ -87,24 +699,25 @@ class TaskManager:
             task_id (int): ID of the task.
             description (str): description of the task.
             priority (str):  priority of the task (low, medium, high).
-            deadline_str (str): deadline for the task in DD-MM-YYYY format.
+            deadline_str (str): deadline for the task in DD-MM-YYYY format, or None for no deadline.
             completed (bool): Whether the task is completed. Defaults to False.
         Raises:
-            ValueError: If the priority is invalid, the date format is incorrect or task ID already exists.
+            ValueError: If the priority is invalid, the date format is incorrect, task ID already exists
+                or cannot be ordered with the other task IDs.
         """
         self.__validate_priority(priority)
 
-        if any(task[0] == task_id for task in self.tasks):
+        if task_id in self.__tasks_by_id:
             raise ValueError(f"Task with ID {task_id} already exists.")
+        self.__validate_id_order(task_id)
 
-        try:
-            deadline = datetime.strptime(deadline_str, "%d-%m-%Y")
-        except ValueError:
-            raise ValueError("Invalid date format. Please use DD-MM-YYYY.")
+        deadline = parse_deadline(deadline_str)
 
-        task = [task_id, description, priority, deadline, completed]
-        self.tasks.append(task)
-        self.__update_sorted_lists()
+        task = self.__new_task(task_id, description, priority, deadline, completed)
+        self.__tasks_by_id[task_id] = task
+        self.__track(task)
+        self.__index_task(task)
+        self.__notify("add", (task,))
 
     def remove_task(self, task_id):
         """
@@ -114,12 +727,12 @@ class TaskManager:
         Returns:
             str: A message indicating if the task was found and removed.
         """
-        for task in self.tasks:
-            if task[0] == task_id:
-                self.tasks.remove(task)
-                self.__update_sorted_lists()
-                return
-        return "Task not found!"
+        task = self.__tasks_by_id.pop(task_id, None)
+        if task is None:
+            return "Task not found!"
+        self.__untrack(task)
+        self.__unindex_task(task)
+        self.__notify("remove", (task,))
 
     def update_task(self, task_id, updated_task):
         """
@@ -132,29 +745,204 @@ class TaskManager:
         Returns:
             str: A message if task was found and updated.
         """
-        valid_keys = {"description", "priority", "deadline", "completed"}
-        for key in updated_task:
-            if key not in valid_keys:
-                raise ValueError(f"Invalid key: {key}. Valid keys are: {', '.join(valid_keys)}")
+        # validate everything first, so a bad value leaves the task and the indexes untouched
+        new_values = self.__parse_changes(updated_task)
 
-        for task in self.tasks:
-            if task[0] == task_id:
-                for key, value in updated_task.items():
-                    if key == "description":
-                        task[1] = value
-                    elif key == "priority":
-                        self.__validate_priority(value)
-                        task[2] = value
-                    elif key == "deadline":
-                        try:
-                            task[3] = datetime.strptime(value, "%d-%m-%Y")
-                        except ValueError:
-                            raise ValueError("Invalid date format. Please use DD-MM-YYYY.")
-                    elif key == "completed":
-                        task[4] = value
-                self.__update_sorted_lists()
-                return
-        return "Task not found!"
+        task = self.__tasks_by_id.get(task_id)
+        if task is None:
+            return "Task not found!"
+
+        self.__untrack(task)
+        self.__unindex_task(task)
+        for field, value in new_values.items():
+            task[field] = value
+        self.__track(task)
+        self.__index_task(task)
+        self.__notify("update", (task,))
+
+    def add_tasks(self, tasks):
+        """
+        Adds many tasks at once. Every row is validated, invalid rows are skipped and
+        reported, and the sorted indexes are rebuilt once at the end.
+        Args:
+            tasks (iterable): Rows of (task_id, description, priority, deadline[, completed]).
+                The deadline can be a DD-MM-YYYY string, a datetime or None, so rows returned
+                by TaskFileManager.load_tasks_from_file can be passed directly.
+        Returns:
+            list of tuple: (row index, error message) for every row that was not added.
+        """
+        errors, added = self.__add_rows(tasks)
+        self.__index_added(added)
+        self.__notify("add", added)
+        return errors
+
+    def add_task_runs(self, runs):
+        """
+        Adds the tasks of the TaskRun objects returned by TaskFileManager.load_task_runs. The result
+        is the same as add_tasks with the tasks of all runs. When the manager is empty and the
+        workers found every task valid, the tasks are taken as they are and the sorted indexes
+        are built by merging the runs, so little work is left to this process.
+        Args:
+            runs (iterable): TaskRun objects, in file order.
+        Returns:
+            list of tuple: (row index, error message) for every row that was not added, with
+                the rows numbered across all runs.
+        """
+        runs = list(runs)
+        if self.__merge_runs(runs):
+            self.__notify("add", list(self.__tasks_by_id.values()))
+            return []
+        errors, added = self.__add_rows(task for run in runs for task in run.tasks)
+        self.__index_added(added)
+        self.__notify("add", added)
+        return errors
+
+    def __merge_runs(self, runs):
+        """
+        Stores and indexes the tasks of trusted runs. Returns False, without changing anything,
+        if the runs need the checks of add_tasks.
+        """
+        if self.compact or self.__tasks_by_id:
+            return False
+        if not all(run.codes_valid and run.priorities == self.PRIORITIES for run in runs):
+            return False
+        tasks_by_id = {task[0]: task for run in runs for task in run.tasks}
+        if len(tasks_by_id) != sum(len(run.tasks) for run in runs):
+            # duplicate IDs, add_tasks reports them
+            return False
+        self.__tasks_by_id = tasks_by_id
+
+        # the codes pack (value, task_id) into ints, so the sort merges the runs with cheap int
+        # comparisons, and the ID in the low bits finds the task again
+        by_deadline = [tasks_by_id[code & TaskRun.ID_MASK]
+                       for code in sorted(itertools.chain.from_iterable(run.deadline_codes for run in runs))]
+        priority_codes = sorted(itertools.chain.from_iterable(run.priority_codes for run in runs))
+        by_priority = [tasks_by_id[code & TaskRun.ID_MASK] for code in priority_codes]
+        # the keys are built inline as __deadline_key and __priority_key would, which saves a call
+        # per task; the runs ranked the priorities like this manager, and the buckets reuse the deadline keys
+        deadline_keys = [(task[3] if task[3] else datetime.max, task[0]) for task in by_deadline]
+        priority_keys = [(code >> 40, code & TaskRun.ID_MASK) for code in priority_codes]
+        self.tasks_by_deadline.rebuild(by_deadline, presorted=True, keys=deadline_keys)
+        self.tasks_by_priority.rebuild(by_priority, presorted=True, keys=priority_keys)
+        bucket_tasks = {priority: [] for priority in self.PRIORITIES}
+        bucket_keys = {priority: [] for priority in self.PRIORITIES}
+        for key, task in zip(deadline_keys, by_deadline):
+            bucket_tasks[task[2]].append(task)
+            bucket_keys[task[2]].append(key)
+        for priority, bucket in self.priority_buckets.items():
+            bucket.rebuild(bucket_tasks[priority], presorted=True, keys=bucket_keys[priority])
+        for run in runs:
+            self.statistics.add_counts(len(run.tasks), run.completed, run.by_priority, run.pending_by_day)
+        if self.text_index is not None:
+            for task in tasks_by_id.values():
+                self.text_index.add(task[0], task[1])
+        return True
+
+    def __index_added(self, added):
+        if self.__is_bulk(len(added)):
+            self.__rebuild_indexes()
+        else:
+            for task in added:
+                self.__index_task(task)
+
+    def __add_rows(self, tasks):
+        # validates and stores the rows, the sorted indexes are left to the caller
+        errors = []
+        added = []
+        for row_index, row in enumerate(tasks):
+            try:
+                if len(row) not in (4, 5):
+                    raise ValueError("Row must have 4 or 5 fields.")
+                task_id, description, priority, deadline = row[:4]
+                completed = row[4] if len(row) == 5 else False
+                self.__validate_priority(priority)
+                if task_id in self.__tasks_by_id:
+                    raise ValueError(f"Task with ID {task_id} already exists.")
+                self.__validate_id_order(task_id)
+                deadline = parse_deadline(deadline)
+                task = self.__new_task(task_id, description, priority, deadline, completed)
+            except (TypeError, ValueError) as e:
+                errors.append((row_index, str(e)))
+                continue
+            self.__tasks_by_id[task_id] = task
+            self.__track(task)
+            added.append(task)
+        return errors, added
+
+    def remove_tasks(self, task_ids):
+        """
+        Removes many tasks at once and updates the sorted indexes once at the end.
+        Args:
+            task_ids (iterable): IDs of the tasks to remove.
+        Returns:
+            list of tuple: (row index, error message) for every ID that was not found or is not a valid ID.
+        """
+        errors = []
+        removed = []
+        for row_index, task_id in enumerate(task_ids):
+            try:
+                task = self.__tasks_by_id.pop(task_id, None)
+            except TypeError as e:
+                errors.append((row_index, str(e)))
+                continue
+            if task is None:
+                errors.append((row_index, "Task not found!"))
+                continue
+            self.__untrack(task)
+            removed.append(task)
+
+        if self.__is_bulk(len(removed)):
+            self.__rebuild_indexes()
+        else:
+            for task in removed:
+                self.__unindex_task(task)
+        self.__notify("remove", removed)
+        return errors
+
+    def update_tasks(self, updates):
+        """
+        Updates many tasks at once. Invalid updates are skipped and reported, and the sorted
+        indexes are updated once at the end.
+        Args:
+            updates (dict or iterable): {task_id: updated_task} or (task_id, updated_task) pairs,
+                where updated_task is a dictionary like the one accepted by update_task.
+        Returns:
+            list of tuple: (row index, error message) for every update that was not applied.
+        """
+        if isinstance(updates, dict):
+            updates = updates.items()
+
+        errors = []
+        changes = []
+        for row_index, row in enumerate(updates):
+            try:
+                if len(row) != 2:
+                    raise ValueError("Row must be a (task_id, updated_task) pair.")
+                task_id, updated_task = row
+                task = self.__tasks_by_id.get(task_id)
+                if task is None:
+                    errors.append((row_index, "Task not found!"))
+                    continue
+                if not isinstance(updated_task, dict):
+                    raise TypeError("Update must be a dictionary of the fields to update.")
+                changes.append((task, self.__parse_changes(updated_task)))
+            except (TypeError, ValueError) as e:
+                errors.append((row_index, str(e)))
+
+        bulk = self.__is_bulk(len(changes))
+        for task, new_values in changes:
+            self.__untrack(task)
+            if not bulk:
+                self.__unindex_task(task)
+            for field, value in new_values.items():
+                task[field] = value
+            self.__track(task)
+            if not bulk:
+                self.__index_task(task)
+        if bulk:
+            self.__rebuild_indexes()
+        self.__notify("update", [task for task, _ in changes])
+        return errors
 
     def get_task(self, task_id):
         """
@@ -164,9 +952,9 @@ class TaskManager:
         Returns:
             list or str: The task details as a list, or a message if the task is not found.
         """
-        task_index = next((i for i, task in enumerate(self.tasks) if task[0] == task_id), -1)
-        if task_index != -1:
-            return self.tasks[task_index]
+        task = self.__tasks_by_id.get(task_id)
+        if task is not None:
+            return task
         return f"Task with id {task_id} not found!"
 
     def filter_tasks_by_deadline(self, date_str, filter_type='before'):
@@ -181,57 +969,253 @@ class TaskManager:
             list: A list of tasks that match the filter criteria.
         """
         # check for empty list
-        if not self.tasks:
+        if not self.__tasks_by_id:
             return []
-        try:
-            target_date = datetime.strptime(date_str, "%d-%m-%Y")
-        except ValueError:
-            raise ValueError("Invalid date format. Please use DD-MM-YYYY.")
-
-        sorted_tasks = quicksort(self.tasks, condition=lambda t: t[3] if t[3] else datetime.max)
 
         if filter_type == 'before':
-            bsindex = binary_search(sorted_tasks, condition=lambda t: t[3], target=target_date, ascending=True)
-            if bsindex == -1:
-                # If no exact match found, return all tasks before the target date
-                filtered_tasks = [task for task in sorted_tasks if task[3] and task[3] < target_date]
-            else:
-                # Include all tasks before the target date
-                filtered_tasks = [task for task in sorted_tasks[:bsindex + 1] if task[3] and task[3] < target_date]
+            return self.tasks_before(date_str)
         elif filter_type == 'after':
-            bsindex = binary_search(sorted_tasks, condition=lambda t: t[3], target=target_date, ascending=False)
-            if bsindex == -1:
-                # If no exact match found, return all tasks after the target date
-                filtered_tasks = [task for task in sorted_tasks if task[3] and task[3] > target_date]
-            else:
-                # Include all tasks after the target date
-                filtered_tasks = [task for task in sorted_tasks[bsindex:] if task[3] and task[3] > target_date]
+            return self.tasks_after(date_str)
         else:
             raise ValueError("Invalid filter_type. Must be 'before' or 'after'.")
-        return filtered_tasks
 
-    def sort_tasks_by_deadline(self, ascending=True):
+    def __deadline_range(self, start, end, include_start=True, include_end=True):
         """
-        Sorts tasks by their deadlines.
+        Finds the slice of tasks_by_deadline with deadlines between start and end.
+        Tasks without a deadline are never part of the range.
         Args:
-            ascending (bool, optional): Sort in ascending order if True, else descendin.
+            start (str, datetime or None): lower bound, None for no lower bound.
+            end (str, datetime or None): upper bound, None for no upper bound.
+            include_start (bool, optional): whether tasks due on start are included.
+            include_end (bool, optional): whether tasks due on end are included.
+        Raises:
+            ValueError: If a date format is incorrect.
         Returns:
-            str: A formatted string of the sorted tasks with deadlines.
+            tuple: (first, last) positions of the range in tasks_by_deadline, last is exclusive.
         """
-        # check for empty list
-        if not self.tasks_by_deadline:
-            return "No tasks to sort."
+        start = parse_deadline(start)
+        end = parse_deadline(end)
+        return deadline_bounds(self.tasks_by_deadline, start, end, include_start, include_end)
 
-        sorted_tasks = self.tasks_by_deadline if ascending else list(reversed(self.tasks_by_deadline))
-        result = "Sorted tasks with valid deadlines:\n"
-        for task in sorted_tasks:
-            result += f"Task ID: {task[0]}, Description: {task[1]}, Deadline: {task[3].strftime('%d-%m-%Y')}\n"
-        return result.strip()
-
-    def sort_tasks_by_priority(self, ascending=True):
+    def tasks_between(self, start, end, include_start=True, include_end=True):
         """
-        Sorts the tasks by priority. The priority is sorted in order: "low", "medium", "high".
-        If there are no tasks, the method returns an empty list.
+        Finds tasks with deadlines between two dates, in O(log N + k).
+        Args:
+            start (str or None): first date in DD-MM-YYYY format, None for no lower bound.
+            end (str or None): last date in DD-MM-YYYY format, None for no upper bound.
+            include_start (bool, optional): whether tasks due on start are included. Defaults to True.
+            include_end (bool, optional): whether tasks due on end are included. Defaults to True.
+        Raises:
+            ValueError: If a date format is incorrect.
+        Returns:
+            list: The matching tasks sorted by deadline. Tasks without a deadline are not included.
+        """
+        first, last = self.__deadline_range(start, end, include_start, include_end)
+        return self.tasks_by_deadline[first:last]
+
+    def tasks_before(self, date_str, inclusive=False):
+        """
+        Finds tasks due before a date.
+        Args:
+            date_str (str): target date in DD-MM-YYYY format.
+            inclusive (bool, optional): whether tasks due on the date are included. Defaults to False.
+        Returns:
+            list: The matching tasks sorted by deadline.
+        """
+        return self.tasks_between(None, date_str, include_end=inclusive)
+
+    def tasks_after(self, date_str, inclusive=False):
+        """
+        Finds tasks due after a date.
+        Args:
+            date_str (str): target date in DD-MM-YYYY format.
+            inclusive (bool, optional): whether tasks due on the date are included. Defaults to False.
+        Returns:
+            list: The matching tasks sorted by deadline.
+        """
+        return self.tasks_between(date_str, None, include_start=inclusive)
+
+    def tasks_on(self, date_str):
+        """
+        Finds tasks due on a date.
+        Args:
+            date_str (str): target date in DD-MM-YYYY format.
+        Returns:
+            list: The matching tasks sorted by task ID.
+        """
+        return self.tasks_between(date_str, date_str)
+
+    def tasks_without_deadline(self):
+        """
+        Finds tasks that have no deadline. They are kept at the end of tasks_by_deadline.
+        Returns:
+            list: The tasks without a deadline sorted by task ID.
+        """
+        first = lower_bound(self.tasks_by_deadline, self.__deadline_value, datetime.max)
+        return self.tasks_by_deadline[first:]
+
+    @staticmethod
+    def format_deadline_row(task):
+        return f"Task ID: {task[0]}, Description: {task[1]}, Deadline: {task[3].strftime('%d-%m-%Y')}"
+
+    @staticmethod
+    def format_priority_row(task):
+        return f"Task ID: {task[0]}, Description: {task[1]}, Priority: {task[2]}"
+
+    @staticmethod
+    def __window(first, last, ascending, offset, limit):
+        """
+        Narrows the positions first..last to offset/limit counted in the iteration direction.
+        """
+        if ascending:
+            first = min(last, first + offset)
+            if limit is not None:
+                last = min(last, first + limit)
+        else:
+            last = max(first, last - offset)
+            if limit is not None:
+                first = max(first, last - limit)
+        return first, last
+
+    def __page(self, index, first, last, limit, cursor, ascending):
+        if cursor is not None:
+            if ascending:
+                first = max(first, index.bisect_right(cursor))
+            else:
+                last = min(last, index.bisect_left(cursor))
+        window_first, window_last = self.__window(first, last, ascending, 0, limit)
+        page = list(index.iter_range(window_first, window_last, ascending))
+        has_more = window_last < last if ascending else window_first > first
+        next_cursor = index.key(page[-1]) if page and has_more else None
+        return page, next_cursor
+
+    def iter_tasks_by_deadline(self, ascending=True, offset=0, limit=None, formatted=False):
+        """
+        Lazily yields the tasks with a deadline in deadline order, without building the whole result.
+        The index must not be changed while the iterator is in use.
+        Args:
+            ascending (bool, optional): earliest deadline first if True, else latest first.
+            offset (int, optional): number of tasks to skip. Defaults to 0.
+            limit (int, optional): maximum number of tasks to yield. Defaults to all.
+            formatted (bool, optional): yield rows formatted like sort_tasks_by_deadline instead of tasks.
+        Returns:
+            iterator: The tasks, or their formatted rows.
+        """
+        first, last = self.__deadline_range(None, None)
+        first, last = self.__window(first, last, ascending, offset, limit)
+        tasks = self.tasks_by_deadline.iter_range(first, last, ascending)
+        return map(self.format_deadline_row, tasks) if formatted else tasks
+
+    def iter_tasks_by_priority(self, ascending=True, offset=0, limit=None, formatted=False):
+        """
+        Lazily yields the tasks in priority order, without building the whole result.
+        The index must not be changed while the iterator is in use.
+        Args:
+            ascending (bool, optional): lowest priority first if True, else highest first.
+            offset (int, optional): number of tasks to skip. Defaults to 0.
+            limit (int, optional): maximum number of tasks to yield. Defaults to all.
+            formatted (bool, optional): yield rows formatted like sort_tasks_by_priority instead of tasks.
+        Returns:
+            iterator: The tasks, or their formatted rows.
+        """
+        first, last = self.__window(0, len(self.tasks_by_priority), ascending, offset, limit)
+        tasks = self.tasks_by_priority.iter_range(first, last, ascending)
+        return map(self.format_priority_row, tasks) if formatted else tasks
+
+    def page_tasks_by_deadline(self, limit=50, cursor=None, ascending=True):
+        """
+        Returns one page of tasks with a deadline, in deadline order. Pages are keyed on the
+        index key of the last task seen, so they stay stable while tasks are added or removed.
+        Args:
+            limit (int, optional): page size. Defaults to 50.
+            cursor (tuple, optional): the cursor returned with the previous page, None for the first page.
+            ascending (bool, optional): earliest deadline first if True, else latest first.
+        Returns:
+            tuple: (list of tasks, cursor of the next page or None if this is the last page).
+        """
+        first, last = self.__deadline_range(None, None)
+        return self.__page(self.tasks_by_deadline, first, last, limit, cursor, ascending)
+
+    def page_tasks_by_priority(self, limit=50, cursor=None, ascending=True):
+        """
+        Returns one page of tasks in priority order. Pages are keyed on the index key of
+        the last task seen, so they stay stable while tasks are added or removed.
+        Args:
+            limit (int, optional): page size. Defaults to 50.
+            cursor (tuple, optional): the cursor returned with the previous page, None for the first page.
+            ascending (bool, optional): lowest priority first if True, else highest first.
+        Returns:
+            tuple: (list of tasks, cursor of the next page or None if this is the last page).
+        """
+        return self.__page(self.tasks_by_priority, 0, len(self.tasks_by_priority), limit, cursor, ascending)
+
+    def search_tasks(self, query, mode="and", prefix=False, priority=None, completed=None, before=None, after=None):
+        """
+        Searches task descriptions for words. Uses the text index when the manager has one,
+        otherwise every description is scanned.
+        Args:
+            query (str): the words to search for, case-insensitive.
+            mode (str, optional): 'and' to match all words, 'or' to match any word. Defaults to 'and'.
+            prefix (bool, optional): match words that start with the query words. Defaults to False.
+            priority (str, optional): only tasks with this priority.
+            completed (bool, optional): only completed tasks if True, only pending tasks if False.
+            before (str, optional): only tasks due before this DD-MM-YYYY date.
+            after (str, optional): only tasks due after this DD-MM-YYYY date.
+        Raises:
+            ValueError: If the mode, the priority or a date format is invalid.
+        Returns:
+            list: The matching tasks sorted by deadline.
+        """
+        if mode not in ("and", "or"):
+            raise ValueError("Invalid mode. Must be 'and' or 'or'.")
+        if priority is not None:
+            self.__validate_priority(priority)
+        before = parse_deadline(before)
+        after = parse_deadline(after)
+
+        if self.text_index is not None:
+            candidates = (self.__tasks_by_id[task_id] for task_id in self.text_index.search(query, mode, prefix))
+        else:
+            candidates = filter(_text_matcher(query, mode, prefix), self.__tasks_by_id.values())
+
+        matching_tasks = [
+            task for task in candidates
+            if (priority is None or task[2] == priority)
+            and (completed is None or bool(task[4]) == completed)
+            and (before is None or (task[3] and task[3] < before))
+            and (after is None or (task[3] and task[3] > after))
+        ]
+        return sort_by_key(matching_tasks, self.tasks_by_deadline.key)
+
+    def query(self):
+        """
+        Starts a query that combines filters, for example
+        manager.query().priority("high").completed(False).due_before("01-09-2024").order_by("deadline").limit(20)
+        Returns:
+            TaskQuery: An empty query over this manager.
+        """
+        return TaskQuery(self)
+
+    def sort_tasks_by_deadline(self, ascending=True):
+        """
+        Sorts tasks by their deadlines.
+        Args:
+            ascending (bool, optional): Sort in ascending order if True, else descendin.
+        Returns:
+            str: A formatted string of the sorted tasks with deadlines.
+        """
+        first, last = self.__deadline_range(None, None)
+        # check for empty list
+        if first == last:
+            return "No tasks to sort."
+
+        rows = self.iter_tasks_by_deadline(ascending, formatted=True)
+        return "Sorted tasks with valid deadlines:\n" + "\n".join(rows)
+
+    def sort_tasks_by_priority(self, ascending=True):
+        """
+        Sorts the tasks by priority. The priority is sorted in order: "low", "medium", "high".
+        If there are no tasks, the method returns an empty list.
         Args:
             ascending (bool, optional): True, sorts in ascending, False, sorts in descending.
         Returns:
@@ -241,11 +1225,7 @@ class TaskManager:
         if not self.tasks_by_priority:
             return []
 
-        sorted_tasks = self.tasks_by_priority if ascending else list(reversed(self.tasks_by_priority))
-        result = []
-        for task in sorted_tasks:
-            result.append(f"Task ID: {task[0]}, Description: {task[1]}, Priority: {task[2]}")
-        return result
+        return list(self.iter_tasks_by_priority(ascending, formatted=True))
 
     def find_task_by_deadline(self, date_str):
         """
@@ -258,48 +1238,389 @@ class TaskManager:
             ValueError: If the provided date_str is not in the format "DD-MM-YYYY".
             -
         """
-        try:
-            target_date = datetime.strptime(date_str, "%d-%m-%Y")
-        except ValueError:
-            raise ValueError("Invalid date format. Please use DD-MM-YYYY.")
-
-        sorted_tasks = self.tasks_by_deadline
-        bsindex = binary_search(sorted_tasks, condition=lambda t: t[3], target=target_date, ascending=True)
-        matching_tasks = []
-        if bsindex != -1:
-            while bsindex < len(sorted_tasks) and sorted_tasks[bsindex][3] == target_date:
-                matching_tasks.append(sorted_tasks[bsindex])
-                bsindex += 1
-        else:
-            matching_tasks = []
-
-        return matching_tasks
+        return self.tasks_on(date_str)
 
     def find_task_by_priority(self, priority):
         """
-        Finds and returns a list of tasks with same priority, in already sorted list by priority
+        Finds and returns a list of tasks with same priority, read from the bucket of that priority.
         Args:
             priority (str): The priority level to search "low", "medium", or "high".
         Returns:
-            list of list: A list of tasks
+            list of list: A list of tasks sorted by deadline, tasks without a deadline last.
         Raises:
             ValueError: If the provided priority is not valid.
         """
         self.__validate_priority(priority)
-        sorted_tasks = self.tasks_by_priority
-        priority_order = {p: i for i, p in enumerate(self.PRIORITIES)}
-        target_priority_value = priority_order[priority]
-        matching_tasks = [task for task in sorted_tasks if priority_order[task[2]] == target_priority_value]
+        return list(self.priority_buckets[priority])
 
+    def most_urgent_tasks(self, priority, k, pending_only=True):
+        """
+        Finds the k tasks of a priority with the earliest deadlines. Only the bucket of that
+        priority is read, and it stops after k tasks.
+        Args:
+            priority (str): The priority level to search "low", "medium", or "high".
+            k (int): maximum number of tasks to return.
+            pending_only (bool, optional): skip completed tasks. Defaults to True.
+        Returns:
+            list of list: Up to k tasks sorted by deadline.
+        Raises:
+            ValueError: If the provided priority is not valid.
+        """
+        self.__validate_priority(priority)
+        matching_tasks = []
+        for task in self.priority_buckets[priority]:
+            if len(matching_tasks) >= k:
+                break
+            if not (pending_only and task[4]):
+                matching_tasks.append(task)
         return matching_tasks
 
 
+class TaskQuery:
+    """
+    A query over a TaskManager built by chaining filters. When it runs, it reads the candidates
+    from the most selective index for its filters, checks the other filters lazily and stops
+    as soon as enough tasks are found, unless the results have to be sorted first.
+    """
+    ORDERS = ("deadline", "priority")
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.__priority = None
+        self.__completed = None
+        self.__start = None
+        self.__end = None
+        self.__include_start = True
+        self.__include_end = True
+        self.__text = None
+        self.__order = None
+        self.__ascending = True
+        self.__offset = 0
+        self.__limit = None
+        self.__text_ids = None
+
+    def priority(self, priority):
+        if priority not in self.manager.PRIORITIES:
+            raise ValueError(f"Invalid priority. Must be one of {', '.join(self.manager.PRIORITIES)}.")
+        self.__priority = priority
+        return self
+
+    def completed(self, completed=True):
+        self.__completed = bool(completed)
+        return self
+
+    def due_before(self, date_str, inclusive=False):
+        self.__end = parse_deadline(date_str)
+        self.__include_end = inclusive
+        return self
+
+    def due_after(self, date_str, inclusive=False):
+        self.__start = parse_deadline(date_str)
+        self.__include_start = inclusive
+        return self
+
+    def due_between(self, start, end, include_start=True, include_end=True):
+        self.due_after(start, include_start)
+        return self.due_before(end, include_end)
+
+    def due_on(self, date_str):
+        return self.due_between(date_str, date_str)
+
+    def matching(self, query, mode="and", prefix=False):
+        """
+        Keeps tasks whose description matches the words of query, like TaskManager.search_tasks.
+        """
+        if mode not in ("and", "or"):
+            raise ValueError("Invalid mode. Must be 'and' or 'or'.")
+        self.__text = (query, mode, prefix)
+        return self
+
+    def order_by(self, field, ascending=True):
+        if field not in self.ORDERS:
+            raise ValueError(f"Invalid order. Must be one of {', '.join(self.ORDERS)}.")
+        self.__order = field
+        self.__ascending = ascending
+        return self
+
+    def offset(self, count):
+        self.__offset = count
+        return self
+
+    def limit(self, count):
+        self.__limit = count
+        return self
+
+    def __has_deadline_filter(self):
+        return self.__start is not None or self.__end is not None
+
+    def __plan(self):
+        """
+        Lists the indexes that can produce the candidates and picks the one with fewest tasks.
+        Returns:
+            tuple: (description, number of candidates, candidate iterator, order of the candidates or None).
+        """
+        manager = self.manager
+        ascending = self.__ascending if self.__order == "deadline" else True
+        deadline_range = (self.__start, self.__end, self.__include_start, self.__include_end)
+        plans = []
+
+        if self.__priority is not None:
+            bucket = manager.priority_buckets[self.__priority]
+            if self.__has_deadline_filter():
+                first, last = deadline_bounds(bucket, *deadline_range)
+            else:
+                first, last = 0, len(bucket)
+            plans.append((f"priority bucket '{self.__priority}'", last - first,
+                          bucket.iter_range(first, last, ascending), "deadline"))
+        if self.__has_deadline_filter():
+            first, last = deadline_bounds(manager.tasks_by_deadline, *deadline_range)
+            plans.append(("deadline range", last - first,
+                          manager.tasks_by_deadline.iter_range(first, last, ascending), "deadline"))
+        if self.__text is not None and manager.text_index is not None:
+            self.__text_ids = manager.text_index.search(*self.__text)
+            plans.append(("text index", len(self.__text_ids), map(manager.get_task, self.__text_ids), None))
+        if self.__order == "priority":
+            index = manager.tasks_by_priority
+            plans.append(("all tasks by priority", len(index), index.iter_range(0, None, self.__ascending), "priority"))
+        else:
+            index = manager.tasks_by_deadline
+            plans.append(("all tasks by deadline", len(index), index.iter_range(0, None, ascending), "deadline"))
+
+        # fewest candidates first, and on a tie a plan that needs no sorting
+        return min(plans, key=lambda plan: (plan[1], self.__order is not None and plan[3] != self.__order))
+
+    def __filters(self, plan_name):
+        filters = []
+        if self.__priority is not None:
+            filters.append(lambda task: task[2] == self.__priority)
+        if self.__completed is not None:
+            filters.append(lambda task: bool(task[4]) == self.__completed)
+        if self.__has_deadline_filter():
+            start, end = self.__start, self.__end
+            filters.append(lambda task: task[3] is not None
+                           and (start is None or task[3] > start or (self.__include_start and task[3] == start))
+                           and (end is None or task[3] < end or (self.__include_end and task[3] == end)))
+        if self.__text is not None and plan_name != "text index":
+            if self.manager.text_index is not None:
+                task_ids = self.__text_ids
+                filters.append(lambda task: task[0] in task_ids)
+            else:
+                filters.append(_text_matcher(*self.__text))
+        return filters
+
+    def explain(self):
+        """
+        Returns:
+            str: Which index the query reads and how many candidates it has.
+        """
+        name, size, _, order = self.__plan()
+        sort = "" if self.__order is None or order == self.__order else f", then sorted by {self.__order}"
+        return f"{name} ({size} candidates{sort})"
+
+    def __iter__(self):
+        name, _, tasks, order = self.__plan()
+        for condition in self.__filters(name):
+            tasks = filter(condition, tasks)
+        if self.__order is not None and order != self.__order:
+            key = self.manager.tasks_by_deadline.key if self.__order == "deadline" else self.manager.tasks_by_priority.key
+            tasks = sort_by_key(tasks, key, self.__ascending)
+        stop = None if self.__limit is None else self.__offset + self.__limit
+        return itertools.islice(tasks, self.__offset, stop)
+
+    def all(self):
+        """
+        Returns:
+            list: The matching tasks.
+        """
+        return list(self)
+
+    def first(self):
+        """
+        Returns:
+            list or None: The first matching task, or None if there is none.
+        """
+        return next(iter(self), None)
+
+    def count(self):
+        """
+        Returns:
+            int: The number of matching tasks, within offset and limit.
+        """
+        return sum(1 for _ in self)
+
+
+class TaskView:
+    """
+    A named standing query over a TaskManager: the tasks matching a predicate, sorted by a key.
+    The manager updates the view on every change with one insert or removal per affected task,
+    so reading it never recomputes the query, and subscribers are told where tasks moved.
+    Created by TaskManager.add_view.
+    Events:
+        "inserted": the task now matches, new_position is its position.
+        "removed": the task no longer matches or was removed, old_position is the position it had.
+        "moved": the sort key of the task changed, from old_position to new_position.
+        "updated": the task changed but kept its sort key, both positions are its position.
+    Attributes:
+        name (str): the name of the view.
+        predicate (function): called as predicate(task), whether the task belongs to the view.
+        key (function): called as key(task), the sort key of the task. Ties are ordered by task ID.
+        tasks (SortedIndex): the matching tasks, in view order.
+    """
+
+    def __init__(self, name, predicate=None, key=None, tasks=()):
+        self.name = name
+        self.predicate = predicate
+        self.key = key
+        # the ID breaks ties, since the keys of a SortedIndex must be unique
+        self.tasks = SortedIndex(self.__key)
+        matching = [task for task in tasks if self.__matches(task)]
+        self.tasks.rebuild(matching)
+        self.__keys_by_id = {task[0]: self.__key(task) for task in matching}
+        self.__subscribers = []
+
+    def __key(self, task):
+        return (self.key(task) if self.key else 0, task[0])
+
+    def __matches(self, task):
+        return self.predicate is None or bool(self.predicate(task))
+
+    def subscribe(self, subscriber):
+        """
+        Registers a function called for every change of the view.
+        Args:
+            subscriber (function): Called as subscriber(event, task, old_position, new_position), where event is
+                "inserted", "removed", "moved" or "updated" and a position is None if it does not apply.
+        """
+        self.__subscribers.append(subscriber)
+
+    def unsubscribe(self, subscriber):
+        """
+        Unregisters a function added with subscribe.
+        Args:
+            subscriber (function): The function to remove.
+        """
+        self.__subscribers.remove(subscriber)
+
+    def on_change(self, action, task):
+        """
+        Applies a change of the manager to the view. Registered as a listener by TaskManager.add_view.
+        Args:
+            action (str): "add", "remove" or "update".
+            task (list): The task after the change.
+        """
+        task_id = task[0]
+        old_key = self.__keys_by_id.get(task_id)
+        matches = action != "remove" and self.__matches(task)
+        if old_key is None and not matches:
+            return
+        if old_key is None:
+            self.__keys_by_id[task_id] = self.__key(task)
+            event, old_position, new_position = "inserted", None, self.tasks.insert(task)
+        elif not matches:
+            del self.__keys_by_id[task_id]
+            event, old_position, new_position = "removed", self.tasks.remove(task, old_key), None
+        else:
+            new_key = self.__key(task)
+            if new_key == old_key:
+                event = "updated"
+                old_position = new_position = self.tasks.bisect_left(old_key)
+            else:
+                self.__keys_by_id[task_id] = new_key
+                event, old_position = "moved", self.tasks.remove(task, old_key)
+                new_position = self.tasks.insert(task)
+        for subscriber in self.__subscribers:
+            subscriber(event, task, old_position, new_position)
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def __iter__(self):
+        return iter(self.tasks)
+
+    def __getitem__(self, index):
+        return self.tasks[index]
+
+
+def _parse_task_line(line):
+    # the ID is the first field and the last three fields never contain commas,
+    # so a description with commas is kept whole
+    task_id, rest = line.split(',', 1)
+    description, priority, deadline_str, completed = rest.rsplit(',', 3)
+    deadline = parse_date(deadline_str) if deadline_str != 'None' else None
+    return [int(task_id), description, priority if priority else None, deadline, completed == 'True']
+
+
+class TaskRun:
+    """
+    The tasks of one chunk of a tasks file, checked and sorted by a worker of
+    TaskFileManager.load_task_runs, so TaskManager.add_task_runs only has to merge the runs.
+    The sort orders are kept as packed ints, (value << 40) | task_id, like the keys of a compact
+    TaskManager, because ints are much cheaper to send between processes and to merge than tuples.
+    Attributes:
+        tasks (list): the tasks in file order.
+        priorities (list): the priorities the tasks were checked and ranked against.
+        codes_valid (bool): whether every task has one of the priorities and an ID that fits in
+            40 bits, so the fields below are set. Otherwise add_task_runs checks every task itself.
+        deadline_codes (list): the tasks sorted by (deadline, task_id), packed.
+        priority_codes (list): the tasks sorted by (priority rank, task_id), packed.
+        completed (int): number of completed tasks.
+        by_priority (dict): number of tasks for every priority.
+        pending_by_day (dict): number of pending tasks by deadline day ordinal.
+    """
+    ID_MASK = (1 << 40) - 1
+    NO_DEADLINE = datetime.max.toordinal() + 1
+
+    def __init__(self, tasks, priorities):
+        self.tasks = tasks
+        self.priorities = list(priorities)
+        self.codes_valid = False
+        self.deadline_codes = self.priority_codes = None
+        self.completed = 0
+        self.by_priority = {priority: 0 for priority in self.priorities}
+        self.pending_by_day = {}
+        rank = {priority: i for i, priority in enumerate(self.priorities)}
+        deadline_codes = []
+        priority_codes = []
+        for task in tasks:
+            task_id, priority, deadline = task[0], task[2], task[3]
+            if priority not in rank or not isinstance(task_id, int) or not 0 <= task_id <= self.ID_MASK:
+                return
+            ordinal = deadline.toordinal() if deadline else self.NO_DEADLINE
+            deadline_codes.append((ordinal << 40) | task_id)
+            priority_codes.append((rank[priority] << 40) | task_id)
+            self.by_priority[priority] += 1
+            if task[4]:
+                self.completed += 1
+            elif deadline:
+                self.pending_by_day[ordinal] = self.pending_by_day.get(ordinal, 0) + 1
+        deadline_codes.sort()
+        priority_codes.sort()
+        self.deadline_codes = deadline_codes
+        self.priority_codes = priority_codes
+        self.codes_valid = True
+
+
+def _parse_task_chunk(filename, start, end, priorities):
+    """
+    Parses the lines between two byte offsets of a tasks file into a TaskRun.
+    Runs in the worker processes of TaskFileManager.load_task_runs.
+    """
+    with open(filename, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    # decoded like a file opened in text mode, with the same encoding and newline handling
+    text = io.TextIOWrapper(io.BytesIO(data)).read()
+    return TaskRun([_parse_task_line(line.strip()) for line in text.split("\n") if line.strip()], priorities)
+
+
 class TaskFileManager:
     """
     Handles saving and loading tasks from a file.
     Attributes:
         filename (str): name of the file to read from and write to.
     """
+    # longest task, in characters, that iter_tasks_from_json decodes from a JSON array
+    MAX_JSON_TASK_LENGTH = 1 << 20
 
     def __init__(self, filename='tasks.txt'):
         self.filename = filename
@@ -312,25 +1633,384 @@ class TaskFileManager:
                 f.write(task_line)
 
     def load_tasks_from_file(self):
-        tasks = []
+        return list(self.iter_tasks_from_file())
+
+    def iter_tasks_from_file(self, chunk_size=1 << 20):
+        """
+        Loads tasks lazily. The file is read in large chunks and every task is yielded as soon
+        as its line is parsed, so callers can start using tasks before the whole file is read.
+        Args:
+            chunk_size (int, optional): number of characters read at a time. Defaults to 1M.
+        Yields:
+            list: The tasks in file order.
+        """
         try:
             with open(self.filename, "r") as f:
-                for line in f:
-                    task_data = line.strip().split(',')
-                    task_id = int(task_data[0])
-                    description = task_data[1]
-                    priority = task_data[2] if task_data[2] else None
-                    deadline = datetime.strptime(task_data[3], "%d-%m-%Y") if task_data[3] != 'None' else None
-                    completed = task_data[4] == 'True'
-                    tasks.append([task_id, description, priority, deadline, completed])
+                remainder = ""
+                while True:
+                    chunk = f.read(chunk_size)
+                    if not chunk:
+                        break
+                    lines = (remainder + chunk).split("\n")
+                    remainder = lines.pop()
+                    for line in lines:
+                        if line.strip():
+                            yield _parse_task_line(line.strip())
+                if remainder.strip():
+                    yield _parse_task_line(remainder.strip())
         except FileNotFoundError:
             print(f"File '{self.filename}' not found. No tasks loaded.")
-        return tasks
+
+    def __chunk_bounds(self, size, chunk_size):
+        # every chunk ends just after a newline, so no line is split between two chunks
+        bounds = []
+        with open(self.filename, "rb") as f:
+            start = 0
+            while start < size:
+                if start + chunk_size >= size:
+                    end = size
+                else:
+                    f.seek(start + chunk_size)
+                    f.readline()
+                    end = f.tell()
+                bounds.append((start, end))
+                start = end
+        return bounds
+
+    def load_task_runs(self, workers=None, chunk_size=None, priorities=None):
+        """
+        Loads tasks in parallel. The file is split into chunks at line boundaries, and worker
+        processes parse the chunks, check the tasks, count them and sort them, so
+        TaskManager.add_task_runs only has to merge the sorted runs.
+        Args:
+            workers (int, optional): number of worker processes. Defaults to os.cpu_count().
+                With one worker the chunks are parsed in this process.
+            chunk_size (int, optional): approximate number of bytes per chunk. Defaults to the
+                file size divided by the number of workers.
+            priorities (list, optional): the priorities of the receiving manager. Defaults to TaskManager.PRIORITIES.
+        Returns:
+            list of TaskRun: One run for every chunk, in file order.
+        """
+        try:
+            size = os.path.getsize(self.filename)
+        except FileNotFoundError:
+            print(f"File '{self.filename}' not found. No tasks loaded.")
+            return []
+        workers = workers or os.cpu_count() or 1
+        priorities = list(priorities or TaskManager.PRIORITIES)
+        bounds = self.__chunk_bounds(size, chunk_size or max(1, -(-size // workers)))
+        if workers == 1 or len(bounds) <= 1:
+            return [_parse_task_chunk(self.filename, start, end, priorities) for start, end in bounds]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            starts, ends = zip(*bounds)
+            return list(executor.map(_parse_task_chunk, itertools.repeat(self.filename), starts, ends,
+                                     itertools.repeat(priorities)))
+
+    def save_tasks_to_ndjson(self, tasks, filename=None):
+        """
+        Saves tasks as NDJSON: one JSON object per line, with the fields of the old tasks.json
+        format. Every task is encoded and written on its own, so any iterable of tasks, for
+        example manager.iter_tasks_by_deadline(), is exported in constant memory.
+        Args:
+            tasks (iterable): the tasks to save.
+            filename (str, optional): the file to write. Defaults to self.filename.
+        """
+        encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        with open(filename or self.filename, "w", encoding="utf-8") as f:
+            for task in tasks:
+                f.write(encode({
+                    "task_id": task[0],
+                    "description": task[1],
+                    "priority": task[2],
+                    "deadline": format_date(task[3]) if task[3] else None,
+                    "completed": task[4],
+                }))
+                f.write("\n")
+
+    @staticmethod
+    def __task_from_record(record):
+        deadline = parse_date(record["deadline"]) if record.get("deadline") else None
+        return [record["task_id"], record["description"], record["priority"], deadline, record["completed"]]
+
+    def iter_tasks_from_json(self, filename=None, chunk_size=1 << 20):
+        """
+        Loads tasks lazily from NDJSON written by save_tasks_to_ndjson, or from a JSON array of
+        task objects as written by the old tasks.json format. The array is decoded one task
+        at a time as the file is read in chunks, so it is never held in memory as a whole.
+        Args:
+            filename (str, optional): the file to read. Defaults to self.filename.
+            chunk_size (int, optional): number of characters read at a time. Defaults to 1M.
+        Raises:
+            ValueError: If chunk_size is not positive, the file is not valid NDJSON or a JSON array,
+                a task in a JSON array is longer than MAX_JSON_TASK_LENGTH or a task misses a field.
+        Yields:
+            list: The tasks in file order.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+        filename = filename or self.filename
+        try:
+            f = open(filename, "r", encoding="utf-8")
+        except FileNotFoundError:
+            print(f"File '{filename}' not found. No tasks loaded.")
+            return
+        with f:
+            start = f.read(chunk_size)
+            skipped_characters = skipped_lines = 0
+            while start and not start.strip():
+                # blank chunks say nothing about the format, skip them but keep the positions right
+                skipped_characters += len(start)
+                skipped_lines += start.count("\n")
+                start = f.read(chunk_size)
+            if start.lstrip().startswith("["):
+                records = self.__iter_json_array(f, start, filename, chunk_size, skipped_characters,
+                                                 self.MAX_JSON_TASK_LENGTH)
+            else:
+                chunks = itertools.chain([start], iter(lambda: f.read(chunk_size), ""))
+                records = self.__iter_ndjson(chunks, filename, skipped_lines)
+            for record in records:
+                if not isinstance(record, dict):
+                    raise ValueError(f"Record {record!r} in '{filename}' is not a task object.")
+                try:
+                    yield self.__task_from_record(record)
+                except KeyError as e:
+                    raise ValueError(f"Task {record!r} in '{filename}' is missing the field {e}.")
+
+    @staticmethod
+    def __iter_ndjson(chunks, filename, line_number=0):
+        remainder = ""
+        for chunk in itertools.chain(chunks, ["\n"]):
+            lines = (remainder + chunk).split("\n")
+            remainder = lines.pop()
+            for line in lines:
+                line_number += 1
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    raise ValueError(f"Corrupted record on line {line_number} of '{filename}'.")
+
+    @staticmethod
+    def __iter_json_array(f, buffer, filename, chunk_size, consumed, max_task_length):
+        decoder = json.JSONDecoder()
+        whitespace = re.compile(r"[ \t\n\r]*")
+        position = whitespace.match(buffer).end() + 1
+        expect_value = True
+        after_comma = False
+        while True:
+            position = whitespace.match(buffer, position).end()
+            if position == len(buffer):
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    raise ValueError(f"Unexpected end of the JSON array in '{filename}'.")
+                # drop what was decoded already, so the buffer stays about one chunk long
+                consumed += position
+                buffer = buffer[position:] + chunk
+                position = 0
+                continue
+            if buffer[position] == "]" and not after_comma:
+                return
+            if not expect_value:
+                if buffer[position] != ",":
+                    raise ValueError(f"Corrupted JSON array in '{filename}' at character {consumed + position}.")
+                position += 1
+                expect_value = after_comma = True
+                continue
+            try:
+                record, end = decoder.raw_decode(buffer, position)
+            except ValueError:
+                # the task may be cut off by the end of the buffer, read on and try again; every retry
+                # at least doubles what is buffered, so a long task is decoded only a few times
+                pending = len(buffer) - position
+                if pending > max_task_length:
+                    raise ValueError(f"Task at character {consumed + position} in '{filename}' is corrupted "
+                                     f"or longer than {max_task_length} characters.")
+                chunk = f.read(max(chunk_size, pending))
+                if not chunk:
+                    raise ValueError(f"Corrupted JSON array in '{filename}' at character {consumed + position}.")
+                consumed += position
+                buffer = buffer[position:] + chunk
+                position = 0
+                continue
+            yield record
+            position = end
+            expect_value = after_comma = False
+
+    def load_tasks_from_json(self, filename=None):
+        return list(self.iter_tasks_from_json(filename))
+
+
+class MappedTaskFile:
+    """
+    Read-only, memory-mapped view of a file written by BinaryTaskFileManager.
+    Opening it only reads the header; a task is decoded when it is accessed.
+    Attributes:
+        filename (str): name of the mapped file.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        with open(filename, "rb") as f:
+            self.__map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = BinaryTaskFileManager.HEADER
+        magic, version, self.__count = header.unpack_from(self.__map, 0)
+        if magic != BinaryTaskFileManager.MAGIC or version != BinaryTaskFileManager.VERSION:
+            self.__map.close()
+            raise ValueError(f"File '{filename}' is not a binary task file.")
+        self.__heap_offset = header.size + self.__count * BinaryTaskFileManager.RECORD.size
+        self.__dates = {}
+
+    def __len__(self):
+        return self.__count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.__count
+        if not 0 <= index < self.__count:
+            raise IndexError("task index out of range")
+        record = BinaryTaskFileManager.RECORD
+        offset = BinaryTaskFileManager.HEADER.size + index * record.size
+        return self.__decode(record.unpack_from(self.__map, offset))
+
+    def __decode(self, fields):
+        task_id, text_offset, text_length, priority_code, ordinal, completed = fields
+        description = None
+        if text_length != BinaryTaskFileManager.NO_DESCRIPTION:
+            start = self.__heap_offset + text_offset
+            description = self.__map[start:start + text_length].decode("utf-8")
+        priority = TaskManager.PRIORITIES[priority_code] if priority_code >= 0 else None
+        deadline = None
+        if ordinal:
+            deadline = self.__dates.get(ordinal)
+            if deadline is None:
+                deadline = self.__dates[ordinal] = datetime.fromordinal(ordinal)
+        return [task_id, description, priority, deadline, completed]
+
+    def __iter__(self):
+        record = BinaryTaskFileManager.RECORD
+        offset = BinaryTaskFileManager.HEADER.size
+        for _ in range(self.__count):
+            yield self.__decode(record.unpack_from(self.__map, offset))
+            offset += record.size
+
+    def close(self):
+        self.__map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class BinaryTaskFileManager(TaskFileManager):
+    """
+    Saves and loads tasks in a binary format: a header, one fixed-width record per task
+    and a heap with the UTF-8 descriptions. The file can be memory-mapped with open_tasks,
+    so only the tasks that are read get decoded, and descriptions may contain commas.
+    Attributes:
+        filename (str): name of the file to read from and write to.
+    """
+    MAGIC = b"TSKB"
+    VERSION = 1
+    # magic, version, number of tasks
+    HEADER = struct.Struct("<4sHQ")
+    # task_id, description offset in the heap, description length, priority code, deadline ordinal, completed
+    RECORD = struct.Struct("<qQIbi?")
+    # description length of a task without a description
+    NO_DESCRIPTION = 0xFFFFFFFF
+    MIN_ID = -(1 << 63)
+    MAX_ID = (1 << 63) - 1
+
+    def __init__(self, filename='tasks.bin'):
+        super().__init__(filename)
+
+    def save_tasks_to_file(self, tasks):
+        """
+        Writes the tasks to a temporary file and then replaces the old file, so a failed
+        save never leaves a partial file behind.
+        Args:
+            tasks (iterable): The tasks to save.
+        Raises:
+            ValueError: If a task has a priority that is not in TaskManager.PRIORITIES,
+                or an ID that is not a 64-bit integer.
+        """
+        priority_codes = {priority: i for i, priority in enumerate(TaskManager.PRIORITIES)}
+        priority_codes[None] = -1
+        records = bytearray()
+        heap = []
+        heap_size = 0
+        count = 0
+        for task in tasks:
+            if not isinstance(task[0], int) or not self.MIN_ID <= task[0] <= self.MAX_ID:
+                raise ValueError(f"Task ID {task[0]!r} cannot be saved, binary task files need 64-bit integer IDs.")
+            if task[2] not in priority_codes:
+                raise ValueError(f"Invalid priority. Must be one of {', '.join(TaskManager.PRIORITIES)}.")
+            ordinal = task[3].toordinal() if task[3] else 0
+            if task[1] is None:
+                records += self.RECORD.pack(task[0], heap_size, self.NO_DESCRIPTION,
+                                            priority_codes[task[2]], ordinal, bool(task[4]))
+            else:
+                text = task[1].encode("utf-8")
+                records += self.RECORD.pack(task[0], heap_size, len(text), priority_codes[task[2]], ordinal, bool(task[4]))
+                heap.append(text)
+                heap_size += len(text)
+            count += 1
+
+        temp_filename = self.filename + ".tmp"
+        with open(temp_filename, "wb") as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.VERSION, count))
+            f.write(records)
+            f.writelines(heap)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_filename, self.filename)
+
+    def open_tasks(self):
+        """
+        Memory-maps the file without decoding any task.
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            ValueError: If the file is not a binary task file.
+        Returns:
+            MappedTaskFile: A lazy, read-only sequence of the saved tasks.
+        """
+        return MappedTaskFile(self.filename)
+
+    def iter_tasks_from_file(self, chunk_size=None):
+        """
+        Loads tasks lazily from the memory-mapped file.
+        Args:
+            chunk_size: unused, records are decoded one at a time.
+        Yields:
+            list: The tasks in file order.
+        """
+        try:
+            with self.open_tasks() as mapped_tasks:
+                yield from mapped_tasks
+        except FileNotFoundError:
+            print(f"File '{self.filename}' not found. No tasks loaded.")
+
+    def load_task_runs(self, workers=None, chunk_size=None, priorities=None):
+        """
+        Loads the tasks as a single TaskRun, like TaskFileManager.load_task_runs.
+        Decoding the fixed-width records is cheap, so the file is not split between processes.
+        Args:
+            workers: unused.
+            chunk_size: unused.
+            priorities (list, optional): the priorities of the receiving manager. Defaults to TaskManager.PRIORITIES.
+        Returns:
+            list of TaskRun: One run, or no run if the file does not exist.
+        """
+        tasks = self.load_tasks_from_file()
+        return [TaskRun(tasks, priorities or TaskManager.PRIORITIES)] if tasks else []
 
 
 class TaskStatistics:
     """
-    Provides static methods for generating task statistics.
+    Provides static methods for generating task statistics from a list of tasks.
+    TaskManager.statistics keeps the same numbers up to date without scanning the tasks.
     """
     @staticmethod
     def count_tasks(tasks):
@@ -350,3 +2030,135 @@ class TaskStatistics:
         completed_tasks = TaskStatistics.count_completed_tasks(tasks)
         pending_tasks = TaskStatistics.count_pending_tasks(tasks)
         return f"Total Tasks: {total_tasks}\nCompleted Tasks: {completed_tasks}\nPending Tasks: {pending_tasks}"
+
+
+class TaskCounters:
+    """
+    Task statistics that TaskManager updates on every change, so reading them never scans the tasks.
+    Attributes:
+        total (int): number of tasks.
+        completed (int): number of completed tasks.
+        by_priority (dict): number of tasks for every priority.
+    """
+
+    def __init__(self, priorities):
+        self.total = 0
+        self.completed = 0
+        self.by_priority = {priority: 0 for priority in priorities}
+        # pending tasks per deadline day, and the days that have any, in order
+        self.__pending_by_day = {}
+        self.__pending_days = []
+        # overdue count as of __overdue_day, moved forward as the days go by
+        self.__overdue_day = None
+        self.__overdue = 0
+
+    @property
+    def pending(self):
+        return self.total - self.completed
+
+    def add(self, task):
+        """
+        Counts a task. Called by TaskManager after a task is added or changed.
+        Args:
+            task (list): The task to count.
+        """
+        self.total += 1
+        self.by_priority[task[2]] = self.by_priority.get(task[2], 0) + 1
+        if task[4]:
+            self.completed += 1
+        elif task[3]:
+            day = task[3].toordinal()
+            count = self.__pending_by_day.get(day, 0)
+            if count == 0:
+                bisect.insort(self.__pending_days, day)
+            self.__pending_by_day[day] = count + 1
+            if self.__overdue_day is not None and day < self.__overdue_day:
+                self.__overdue += 1
+
+    def add_counts(self, total, completed, by_priority, pending_by_day):
+        """
+        Counts many tasks at once from counts made elsewhere, as by TaskRun.
+        Args:
+            total (int): number of tasks.
+            completed (int): number of completed tasks among them.
+            by_priority (dict): number of tasks for every priority.
+            pending_by_day (dict): number of pending tasks by deadline day ordinal.
+        """
+        self.total += total
+        self.completed += completed
+        for priority, count in by_priority.items():
+            self.by_priority[priority] = self.by_priority.get(priority, 0) + count
+        for day, count in pending_by_day.items():
+            previous = self.__pending_by_day.get(day, 0)
+            if previous == 0:
+                bisect.insort(self.__pending_days, day)
+            self.__pending_by_day[day] = previous + count
+            if self.__overdue_day is not None and day < self.__overdue_day:
+                self.__overdue += count
+
+    def remove(self, task):
+        """
+        Stops counting a task. Called by TaskManager before a task is removed or changed.
+        Args:
+            task (list): The task to stop counting.
+        """
+        self.total -= 1
+        self.by_priority[task[2]] -= 1
+        if task[4]:
+            self.completed -= 1
+        elif task[3]:
+            day = task[3].toordinal()
+            count = self.__pending_by_day[day] - 1
+            if count == 0:
+                del self.__pending_by_day[day]
+                del self.__pending_days[bisect.bisect_left(self.__pending_days, day)]
+            else:
+                self.__pending_by_day[day] = count
+            if self.__overdue_day is not None and day < self.__overdue_day:
+                self.__overdue -= 1
+
+    def count_overdue(self, today=None):
+        """
+        Counts pending tasks whose deadline is before today. Moving today forward only adds
+        up the days that passed since the previous call.
+        Args:
+            today (datetime, optional): the current date. Defaults to datetime.now().
+        Returns:
+            int: The number of overdue tasks.
+        """
+        day = (today or datetime.now()).toordinal()
+        days = self.__pending_days
+        if self.__overdue_day is None or day < self.__overdue_day:
+            first, self.__overdue = 0, 0
+        else:
+            first = bisect.bisect_left(days, self.__overdue_day)
+        for passed_day in days[first:bisect.bisect_left(days, day)]:
+            self.__overdue += self.__pending_by_day[passed_day]
+        self.__overdue_day = day
+        return self.__overdue
+
+    def count_due_on(self, date_str):
+        """
+        Counts pending tasks due on a date.
+        Args:
+            date_str (str): date in DD-MM-YYYY format.
+        Returns:
+            int: The number of pending tasks due on that date.
+        """
+        return self.__pending_by_day.get(parse_date(date_str).toordinal(), 0)
+
+    def summary(self, today=None):
+        """
+        Returns:
+            dict: total, completed, pending and overdue counts and the counts by priority.
+        """
+        return {
+            "total": self.total,
+            "completed": self.completed,
+            "pending": self.pending,
+            "overdue": self.count_overdue(today),
+            "by_priority": dict(self.by_priority),
+        }
+
+    def generate_task_summary(self):
+        return f"Total Tasks: {self.total}\nCompleted Tasks: {self.completed}\nPending Tasks: {self.pending}"
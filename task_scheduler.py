@@ -0,0 +1,140 @@
+import heapq
+import itertools
+from datetime import datetime
+
+
+class TaskScheduler:
+    """
+    Hands out the most urgent pending task of a TaskManager: highest priority first, then
+    earliest deadline, then lowest task ID. Tasks are kept in a heap, so every operation is
+    O(log N). Changes made through the manager are picked up with lazy invalidation: a changed
+    task gets a new heap entry and its old entry is skipped when it reaches the top. Every entry
+    carries a version number, so an entry made stale by a change is never mistaken for a newer
+    entry with the same fields.
+    Attributes:
+        manager (TaskManager): the scheduled task manager.
+        in_progress (set): IDs of the tasks handed out by pop_next and not completed or released yet.
+    """
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.in_progress = set()
+        self.__priority_rank = {priority: i for i, priority in enumerate(manager.PRIORITIES)}
+        self.__versions = itertools.count()
+        # the current entry of every queued task, entries in the heap that differ are stale
+        self.__entries = {}
+        for task in manager.tasks:
+            if not task[4]:
+                self.__entries[task[0]] = self.__entry(task)
+        self.__heap = list(self.__entries.values())
+        heapq.heapify(self.__heap)
+        manager.add_listener(self.__on_change)
+
+    def __entry(self, task):
+        return (-self.__priority_rank[task[2]], task[3] if task[3] else datetime.max, task[0], next(self.__versions))
+
+    def __push(self, task):
+        entry = self.__entry(task)
+        current = self.__entries.get(task[0])
+        if current is None or current[:3] != entry[:3]:
+            self.__entries[task[0]] = entry
+            heapq.heappush(self.__heap, entry)
+            # stale entries are dropped in one pass once they outnumber the live ones
+            if len(self.__heap) > 2 * len(self.__entries) + 64:
+                self.__heap = list(self.__entries.values())
+                heapq.heapify(self.__heap)
+
+    def __on_change(self, action, task):
+        task_id = task[0]
+        if action == "remove" or task[4]:
+            self.__entries.pop(task_id, None)
+            self.in_progress.discard(task_id)
+        elif task_id not in self.in_progress:
+            self.__push(task)
+
+    def __top(self):
+        while self.__heap:
+            entry = self.__heap[0]
+            if self.__entries.get(entry[2]) == entry:
+                return entry
+            heapq.heappop(self.__heap)
+        return None
+
+    def peek_next(self):
+        """
+        Returns:
+            list or None: The most urgent pending task, without handing it out, or None if there is none.
+        """
+        entry = self.__top()
+        return self.manager.get_task(entry[2]) if entry else None
+
+    def pop_next(self, complete=False):
+        """
+        Hands out the most urgent pending task. It stays out of the queue until it is completed,
+        removed or given back with release.
+        Args:
+            complete (bool, optional): mark the task as completed right away instead of in progress.
+        Returns:
+            list or None: The task, or None if there is no pending task.
+        """
+        entry = self.__top()
+        if entry is None:
+            return None
+        heapq.heappop(self.__heap)
+        task_id = entry[2]
+        del self.__entries[task_id]
+        if complete:
+            self.manager.update_task(task_id, {"completed": True})
+        else:
+            self.in_progress.add(task_id)
+        return self.manager.get_task(task_id)
+
+    def next_k(self, k):
+        """
+        Finds the k most urgent pending tasks without handing them out, in O(k log N).
+        Args:
+            k (int): maximum number of tasks to return.
+        Returns:
+            list: Up to k tasks, most urgent first.
+        """
+        entries = []
+        while len(entries) < k and self.__top() is not None:
+            entries.append(heapq.heappop(self.__heap))
+        for entry in entries:
+            heapq.heappush(self.__heap, entry)
+        return [self.manager.get_task(entry[2]) for entry in entries]
+
+    def complete(self, task_id):
+        """
+        Marks a task handed out by pop_next as completed.
+        Args:
+            task_id (int): ID of the task.
+        Returns:
+            str: A message if the task was not found.
+        """
+        self.in_progress.discard(task_id)
+        return self.manager.update_task(task_id, {"completed": True})
+
+    def release(self, task_id):
+        """
+        Puts a task handed out by pop_next back in the queue.
+        Args:
+            task_id (int): ID of the task.
+        Returns:
+            str: A message if the task was not found.
+        """
+        self.in_progress.discard(task_id)
+        task = self.manager.get_task(task_id)
+        if isinstance(task, str):
+            return task
+        if not task[4]:
+            self.__push(task)
+
+    def close(self):
+        """
+        Stops following the manager's changes.
+        """
+        self.manager.remove_listener(self.__on_change)
+
+    def __len__(self):
+        return len(self.__entries)
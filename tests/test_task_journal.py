@@ -0,0 +1,83 @@
+"""
+Recovery tests for TaskJournal, including compactions that fail or are cut short by a crash.
+
+    python -m unittest discover tests
+"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from task_journal import TaskJournal
+from task_manager import BinaryTaskFileManager, TaskManager
+
+
+class TaskJournalRecoveryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "tasks")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def open_journal(self):
+        journal = TaskJournal(TaskManager(), self.filename, sync_interval=None, compact_after=None)
+        self.assertEqual(journal.recover(), [])
+        return journal
+
+    def recovered_tasks(self):
+        journal = self.open_journal()
+        tasks = sorted(journal.manager.tasks)
+        journal.close()
+        return tasks
+
+    def test_compactions_keep_every_task(self):
+        journal = self.open_journal()
+        journal.manager.add_task(1, "Write report", "high", "01-02-2025")
+        journal.manager.add_task(2, None, "low", None)
+        journal.compact(wait=True)
+        journal.manager.add_task(3, "Review", "medium", None)
+        journal.compact(wait=True)
+        journal.close()
+
+        self.assertEqual([task[0] for task in self.recovered_tasks()], [1, 2, 3])
+        self.assertFalse(os.path.exists(self.filename + ".log.old"))
+
+    def test_failed_snapshot_keeps_its_log(self):
+        journal = self.open_journal()
+        journal.manager.add_task(1, "Write report", "high", None)
+        with mock.patch.object(BinaryTaskFileManager, "save_tasks_to_file", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                journal.compact(wait=True)
+        journal.manager.add_task(2, "Review", "low", None)
+        with mock.patch.object(BinaryTaskFileManager, "save_tasks_to_file", side_effect=OSError("disk full")):
+            journal.compact()
+            # the error of a compaction that was not waited for is raised by the next call
+            with self.assertRaises(OSError):
+                journal.close()
+
+        self.assertEqual([task[0] for task in self.recovered_tasks()], [1, 2])
+
+    def test_crash_during_compaction(self):
+        journal = self.open_journal()
+        journal.manager.add_task(1, "Write report", "high", None)
+        journal.manager.add_task(2, "Review", "low", None)
+        journal.compact(wait=True)
+        journal.manager.update_task(1, {"completed": True})
+        journal.manager.remove_task(2)
+        # the process dies after the log was swapped out, before the snapshot is written,
+        # and the journal is never closed
+        with mock.patch.object(BinaryTaskFileManager, "save_tasks_to_file", side_effect=OSError("crash")):
+            with self.assertRaises(OSError):
+                journal.compact(wait=True)
+        journal.manager.add_task(3, "Plan", "medium", None)
+        journal.sync()
+        self.assertTrue(os.path.exists(self.filename + ".log.old"))
+
+        self.assertEqual(self.recovered_tasks(), [[1, "Write report", "high", None, True], [3, "Plan", "medium", None, False]])
+        self.assertFalse(os.path.exists(self.filename + ".log.old"))
+
+
+if __name__ == "__main__":
+    unittest.main()